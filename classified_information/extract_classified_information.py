@@ -8,66 +8,178 @@ previous version.
 
 Usage:
     python extract_classified_information.py <pdf_file>
+    python extract_classified_information.py <pdf_file> --workers N
 """
 
 import fitz  # PyMuPDF
+import functools
+import itertools
 import json
+import multiprocessing
 import re
 import sys
-from typing import Dict, Optional, Tuple
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
-def parse_control_header(text: str) -> Optional[Tuple[str, str]]:
+try:
+    import orjson  # Optional faster JSON encoder
+except ImportError:
+    orjson = None
+
+# One line of page text with surrounding whitespace trimmed ("line"), classified
+# in the same pass as a control header, a field header, or plain text
+_PAGE_SCAN_RE = re.compile(r'''
+    ^[^\S\n]*
+    (?P<line>
+        (?P<control_id>[A-Z]{2}-\d{1,2}(?:\(\d+\))?),[^\S\n]*
+        (?:\([^)\n]+\)[^\S\n]*)?(?P<name>\S.*?)
+      | (?P<field>Justification\ to\ Select|Parameter\ Value|Guidance|Reference\(s\)|Reference):
+        [^\S\n]*(?P<content>.*?)
+      | .*?
+    )
+    [^\S\n]*$
+''', re.MULTILINE | re.VERBOSE)
+
+# Section headings that bound the control specifications
+_SECTION6_RE = re.compile(r'\b6\.\s+Detailed Overlay Control Specifications\b')
+_SECTION7_RE = re.compile(r'\b7\.\s*Implementation Considerations\b')
+
+# Control fields that collect text from the field header and continuation lines
+_TEXT_FIELDS = ("justification", "parameter_value", "guidance", "references")
+
+# Page header/footer lines to skip
+_SKIP_EXACT = frozenset({"Classified System Overlay", "09/30/2022"})
+# Running footer, matched anywhere in a line
+_SKIP_FOOTER = "Attachment 5 to Appendix E"
+
+# Field header label -> control field it starts
+_FIELD_KEYS = {
+    "Justification to Select": "justification",
+    "Parameter Value": "parameter_value",
+    "Guidance": "guidance",
+    "Reference(s)": "references",
+    "Reference": "references"
+}
+
+# Line events produced by _scan_page_text()
+_HEADER, _FIELD, _TEXT, _STOP = range(4)
+
+def _join_fields(controls: Dict) -> Dict:
     """
-    Parse a control header line to extract control ID and name.
-    
-    Examples:
-    - "AC-3(4), Access Enforcement | Discretionary Access Controls"
-    - "AC-5, Separation of Duties"
-    - "AC-1, (Access Control) Policy and Procedures"
+    Join the line parts collected for each text field into a single string
+    (None for fields that never received any text).
+    """
+    for control in controls.values():
+        for field in _TEXT_FIELDS:
+            parts = control[field]
+            control[field] = " ".join(parts) if parts else None
+    return controls
+
+def _scan_page_text(text: str) -> List[Tuple]:
+    """
+    Classify the lines of one page into parser events.
     
-    Returns: (control_id, control_name) or None
+    Events are (_HEADER, control_id, name), (_FIELD, field, content),
+    (_TEXT, line) and (_STOP,) for the start of Section 7; skipped lines
+    produce no event. Classification does not depend on parser state, so
+    pages can be scanned independently and replayed in order.
     """
-    # Pattern for base controls and enhancements
-    pattern = r'^([A-Z]{2}-\d{1,2}(?:\(\d+\))?),\s*(.+)$'
-    match = re.match(pattern, text.strip())
-    if match:
-        control_id = match.group(1)
-        control_name = match.group(2).strip()
+    events = []
+    
+    # findall classifies every line of the page inside the regex engine and
+    # returns plain (line, control_id, name, field, content) tuples, with ''
+    # for groups that did not take part in the match
+    for line, control_id, name, field, content in _PAGE_SCAN_RE.findall(text):
+        # Stop if we hit Section 7
+        if "7." in line and "Implementation Considerations" in line:
+            events.append((_STOP,))
+            break
         
-        # Remove family name in parentheses at the beginning if present
-        # e.g., "(Access Control) Policy and Procedures" -> "Policy and Procedures"
-        family_pattern = r'^\([^)]+\)\s*(.+)$'
-        family_match = re.match(family_pattern, control_name)
-        if family_match:
-            control_name = family_match.group(1)
-            
-        return control_id, control_name
-    return None
+        # Skip empty lines and page headers/footers
+        if not line or line in _SKIP_EXACT or line.isdigit() or _SKIP_FOOTER in line:
+            continue
+        
+        # Check if this is a control header
+        if control_id:
+            events.append((_HEADER, control_id, name))
+        # Check for field headers
+        elif field:
+            events.append((_FIELD, _FIELD_KEYS[field], content))
+        # Possible continuation of the previous field (the scan regex has
+        # already ruled out a control header)
+        else:
+            events.append((_TEXT, line))
+    
+    return events
+
+def _scan_page(doc, page_num: int) -> Tuple[bool, bool, List[Tuple]]:
+    """
+    Read one page and return (has Section 6 heading, has Section 7 heading, events).
+    """
+    text = doc[page_num].get_text("text")
+    is_section_6 = _SECTION6_RE.search(text) is not None
+    is_section_7 = _SECTION7_RE.search(text) is not None
+    return is_section_6, is_section_7, _scan_page_text(text)
+
+@functools.lru_cache(maxsize=None)
+def _worker_document(pdf_path: str):
+    """Document handle opened once per worker process."""
+    return fitz.open(pdf_path)
+
+def _scan_page_worker(args: Tuple[str, int]) -> Tuple[bool, bool, List[Tuple]]:
+    """Process pool entry point for _scan_page()."""
+    pdf_path, page_num = args
+    return _scan_page(_worker_document(pdf_path), page_num)
 
-def extract_controls_from_pdf(pdf_path: str) -> Dict:
+def extract_controls_from_pdf(pdf_path: str, workers: Optional[int] = 1) -> Dict:
     """
     Extract all controls from Section 6 of the PDF.
     
+    Pages are read and scanned in this process by default; `workers` > 1 uses
+    a pool of that many processes and None one per CPU. The scanned events are
+    then applied in page order, so fields that continue across pages are kept
+    intact.
+    
     Returns a dictionary mapping control IDs to their specifications.
     """
     doc = fitz.open(pdf_path)
+    page_count = len(doc)
     controls = {}
     
+    pool = None
+    if workers == 1:
+        pages = (_scan_page(doc, page_num) for page_num in range(page_count))
+    else:
+        # Each worker opens its own handle; documents are not shared across processes
+        doc.close()
+        pool = multiprocessing.Pool(workers)
+        pages = pool.imap(_scan_page_worker, [(pdf_path, page_num) for page_num in range(page_count)])
+    
     # Find the start of Section 6
     section_6_start = None
     section_7_start = None
     
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
-        
-        if "6.  Detailed Overlay Control Specifications" in text or "6. Detailed Overlay Control Specifications" in text:
-            section_6_start = page_num
-            print(f"Found Section 6 on page {page_num + 1}")
-        elif section_6_start is not None and ("7." in text and "Implementation Considerations" in text):
-            section_7_start = page_num
-            print(f"Found Section 7 on page {page_num + 1}")
-            break
+    # Events of pages from Section 6 onwards, kept so pages are only read once
+    page_events = {}
+    
+    try:
+        for page_num, (is_section_6, is_section_7, events) in enumerate(pages):
+            if is_section_6:
+                section_6_start = page_num
+                print(f"Found Section 6 on page {page_num + 1}")
+            elif section_6_start is not None and is_section_7:
+                section_7_start = page_num
+                print(f"Found Section 7 on page {page_num + 1}")
+                page_events[page_num] = events
+                break
+            
+            if section_6_start is not None:
+                page_events[page_num] = events
+    finally:
+        if pool is not None:
+            pool.terminate()
+        else:
+            doc.close()
     
     if section_6_start is None:
         print("ERROR: Could not find Section 6")
@@ -75,39 +187,21 @@ def extract_controls_from_pdf(pdf_path: str) -> Dict:
     
     # Process pages in Section 6
     # Include the page where section 7 starts since it may have controls before section 7
-    end_page = (section_7_start + 1) if section_7_start else len(doc)
+    end_page = (section_7_start + 1) if section_7_start else page_count
     
     current_control = None
     current_field = None
     
     for page_num in range(section_6_start, end_page):
-        page = doc[page_num]
-        text = page.get_text()
-        
-        # Split into lines and process
-        lines = text.split('\n')
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
+        for event in page_events[page_num]:
+            kind = event[0]
             
-            # Stop if we hit Section 7
-            if "7." in line and "Implementation Considerations" in line:
+            if kind == _STOP:
                 print(f"Stopping at Section 7 on page {page_num + 1}")
-                doc.close()
-                return controls
+                return _join_fields(controls)
             
-            # Skip empty lines and page headers/footers
-            if not line or line == "Classified System Overlay" or line.isdigit():
-                continue
-            if "Attachment 5 to Appendix E" in line:
-                continue
-            if line == "09/30/2022":
-                continue
-                
-            # Check if this is a control header
-            control_info = parse_control_header(line)
-            if control_info:
-                control_id, control_name = control_info
+            if kind == _HEADER:
+                _, control_id, control_name = event
                 current_control = control_id
                 current_field = None
                 
@@ -115,46 +209,24 @@ def extract_controls_from_pdf(pdf_path: str) -> Dict:
                     "control_id": control_id,
                     "name": control_name,
                     "selected": True,  # All controls in this overlay are selected
-                    "justification": None,
-                    "parameter_value": None,
-                    "guidance": None,
-                    "references": None
+                    # Text fields hold lists of line parts until _join_fields()
+                    "justification": [],
+                    "parameter_value": [],
+                    "guidance": [],
+                    "references": []
                 }
+            elif not current_control:
                 continue
-            
             # Check for field headers
-            if current_control:
-                if line.startswith("Justification to Select:"):
-                    current_field = "justification"
-                    content = line[len("Justification to Select:"):].strip()
-                    if content:
-                        controls[current_control]["justification"] = content
-                elif line.startswith("Parameter Value:"):
-                    current_field = "parameter_value"
-                    content = line[len("Parameter Value:"):].strip()
-                    if content:
-                        controls[current_control]["parameter_value"] = content
-                elif line.startswith("Guidance:"):
-                    current_field = "guidance"
-                    content = line[len("Guidance:"):].strip()
-                    if content:
-                        controls[current_control]["guidance"] = content
-                elif line.startswith("Reference(s):") or line.startswith("Reference:"):
-                    current_field = "references"
-                    content = line[line.find(":") + 1:].strip()
-                    if content:
-                        controls[current_control]["references"] = content
-                # Continue previous field
-                elif current_field and line:
-                    # Check if this might be a new control (safety check)
-                    if not parse_control_header(line):
-                        if controls[current_control][current_field]:
-                            controls[current_control][current_field] += " " + line
-                        else:
-                            controls[current_control][current_field] = line
-    
-    doc.close()
-    return controls
+            elif kind == _FIELD:
+                _, current_field, content = event
+                if content:
+                    controls[current_control][current_field] = [content]
+            # Continue previous field
+            elif current_field:
+                controls[current_control][current_field].append(event[1])
+    
+    return _join_fields(controls)
 
 def print_summary(controls: Dict):
     """Print a summary of extracted controls."""
@@ -166,18 +238,9 @@ def print_summary(controls: Dict):
         return
     
     # Count by family
-    families = {}
-    base_controls = 0
-    enhancements = 0
-    
-    for control_id in controls.keys():
-        family = control_id.split('-')[0]
-        families[family] = families.get(family, 0) + 1
-        
-        if '(' in control_id:
-            enhancements += 1
-        else:
-            base_controls += 1
+    families = Counter(control_id.split('-')[0] for control_id in controls)
+    enhancements = sum(1 for control_id in controls if '(' in control_id)
+    base_controls = len(controls) - enhancements
     
     print(f"Base controls: {base_controls}")
     print(f"Enhancements: {enhancements}")
@@ -188,7 +251,7 @@ def print_summary(controls: Dict):
     
     # Show some examples
     print("\nFirst 5 controls:")
-    for i, (control_id, control) in enumerate(list(controls.items())[:5]):
+    for control_id, control in itertools.islice(controls.items(), 5):
         print(f"\n{control_id}: {control['name']}")
         if control['justification']:
             print(f"  Justification: {control['justification'][:100]}...")
@@ -200,20 +263,35 @@ def print_summary(controls: Dict):
             print(f"  References: {control['references']}")
 
 def main():
+    usage = "Usage: python extract_classified_information.py <pdf_file> [--workers N]"
     if len(sys.argv) < 2:
-        print("Usage: python extract_classified_information.py <pdf_file>")
+        print(usage)
         sys.exit(1)
     
     pdf_file = sys.argv[1]
     output_file = "extracted_classified_information.json"
+    options = sys.argv[2:]
+    
+    # Pages are read in this process unless --workers N asks for a pool
+    workers = 1
+    if '--workers' in options:
+        index = options.index('--workers') + 1
+        if index == len(options) or not options[index].isdecimal() or int(options[index]) < 1:
+            print(usage)
+            sys.exit(1)
+        workers = int(options[index])
     
     print("Extracting Classified Information Overlay...")
-    controls = extract_controls_from_pdf(pdf_file)
+    controls = extract_controls_from_pdf(pdf_file, workers)
     
     if controls:
         # Save to JSON
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(controls, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(controls, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(controls, f, indent=2, ensure_ascii=False)
         print(f"\nSaved {len(controls)} controls to {output_file}")
         
         print_summary(controls)
@@ -9,18 +9,62 @@ Usage:f
     python classified_information_overlay_extractor.py <pdf_file>
     python classified_information_overlay_extractor.py <pdf_file> --debug-page N
     python classified_information_overlay_extractor.py <pdf_file> --search-9
+    python classified_information_overlay_extractor.py <pdf_file> --workers N
 """
 
 import fitz  # PyMuPDF for PDF parsing
+import functools
 import json
+import multiprocessing
 import re
 import sys
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson  # Optional faster JSON encoder
+except ImportError:
+    orjson = None
+
+# Text dict flags without image blocks, which the parser ignores anyway
+_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Page footer lines to skip
+_SKIP_EXACT = frozenset({"Classified Information Overlay", "May 9, 2014"})
+
+# Base control line, e.g. "AC-3, ACCESS ENFORCEMENT"
+_BASE_CONTROL_RE = re.compile(r'^([A-Z]{2}-\d{1,2}),?\s*(.+)$')
 
 class ClassifiedControlExtractor:
     """
     Extracts controls and enhancements from a classified overlay PDF.
     """
+    # Lines like 'Control Enhancement: 4, 5, 6'. The lookahead accepts the two
+    # line shapes the extractor has always recognized; the numbers are then
+    # captured in group 1.
+    _ENH_RE = re.compile(r'''
+        ^Control
+        (?=
+            # Any spacing around "Enhancement" and ":", number list ends the line
+            \s*Enhancement\s*:\s*\d+(?:,\s*\d+)*$
+            # Single space before "Enhancement", text may follow the number list
+          | \ Enhancement\s*:\s*\d+(?:,\s*\d+)*(?:.*|\s*)$
+        )
+        \s*Enhancement\s*:\s*
+        (\d+(?:,\s*\d+)*)  # enhancement numbers, e.g. "4, 5, 6"
+    ''', re.IGNORECASE | re.VERBOSE)
+
+    # Known attribute names followed by a colon, longest alternatives first
+    _ATTR_RE = re.compile(
+        r'^(Justification to Select'
+        r'|Supplemental Guidance'
+        r'|Parameter Value\(s\)'
+        r'|Parameter Value'
+        r'|Regulatory/Statutory Reference\(s\)'
+        r'|Control Extension and Parameter Value\(s\)'
+        r'|Control Extension\(s\)'
+        r'|Control Extension):'
+    )
+
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
         self.controls = {}  # All extracted controls
@@ -28,16 +72,31 @@ class ClassifiedControlExtractor:
         self.current_base_control = None  # Current base control (e.g., "AC-3")
         self.current_attribute = None  # Current attribute being appended to
 
-    def extract_controls(self) -> Dict:
+    def extract_controls(self, workers: Optional[int] = 1) -> Dict:
         """
         Extract all controls and enhancements from the PDF.
+        Page text is read in this process by default; `workers` > 1 uses a pool
+        of that many processes and None one per CPU. Pages are parsed here in
+        page order.
         """
         try:
             doc = fitz.open(self.pdf_path)
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                self._process_page(page, page_num + 1)
-            doc.close()
+            if workers == 1:
+                for page_num in range(len(doc)):
+                    page = doc[page_num]
+                    self._process_page(page, page_num + 1)
+                doc.close()
+            else:
+                page_count = len(doc)
+                # Each worker opens its own handle; documents are not shared across processes
+                doc.close()
+                with multiprocessing.Pool(workers) as pool:
+                    pages = pool.imap(_formatted_page_worker,
+                                      [(self.pdf_path, page_num) for page_num in range(page_count)])
+                    for page_num, formatted_text in enumerate(pages, 1):
+                        if formatted_text is not None:
+                            self._process_formatted_text(formatted_text, page_num)
+            self._join_attributes()
             return self.controls
         except Exception as e:
             print(f"Error processing PDF: {e}")
@@ -47,63 +106,61 @@ class ClassifiedControlExtractor:
         """
         Process a single PDF page: extract formatted text and parse controls/attributes.
         """
+        formatted_text = self._read_formatted_text(page)
+        if formatted_text is not None:
+            self._process_formatted_text(formatted_text, page_num)
+
+    @staticmethod
+    def _read_formatted_text(page) -> Optional[List[dict]]:
+        """
+        Read the formatted text of a page, or None if the page cannot be read.
+        """
+        try:
+            text_dict = page.get_text("dict", flags=_DICT_FLAGS)
+            return ClassifiedControlExtractor._extract_formatted_text(text_dict)
+        except Exception as e:
+            return None
+
+    def _process_formatted_text(self, formatted_text: List[dict], page_num: int):
+        """
+        Parse controls/attributes from the formatted text of one page.
+        """
         try:
-            text_dict = page.get_text("dict")
-            formatted_text = self._extract_formatted_text(text_dict)
             self._find_controls_and_attributes(formatted_text, page_num)
         except Exception as e:
             pass
 
-    def _extract_formatted_text(self, text_dict: dict) -> List[dict]:
+    @staticmethod
+    def _extract_formatted_text(text_dict: dict) -> List[dict]:
         """
-        Extract lines of text with formatting (bold, font, etc.) from a PDF text dict.
-        Skips footers and page numbers.
+        Extract lines of text with their bold flag from a PDF text dict.
+        Only span text and the bold flag are read; skips footers and page numbers.
         """
         formatted_text = []
         for block in text_dict.get("blocks", []):
             if block.get("type") == 0:  # Text block
                 for line in block.get("lines", []):
-                    line_text = ""
-                    line_formats = []
+                    line_text_parts = []
+                    line_is_bold = False
                     for span in line.get("spans", []):
-                        text = span.get("text", "")
-                        flags = span.get("flags", 0)
-                        line_text += text
-                        line_formats.append({
-                            "text": text,
-                            "bold": bool(flags & 16),
-                            "font": span.get("font", ""),
-                            "flags": flags
-                        })
-                    if line_text.strip():
-                        # Skip footers and page numbers
-                        stripped = line_text.strip()
-                        if (stripped == "Classified Information Overlay" or
-                            stripped.isdigit() or
-                            stripped == "May 9, 2014"):
-                            continue
-                        formatted_text.append({
-                            "text": stripped,
-                            "formats": line_formats
-                        })
+                        if span.get("flags", 0) & 16:
+                            line_is_bold = True
+                        line_text_parts.append(span.get("text", ""))
+                    # Skip blank lines, footers and page numbers
+                    stripped = "".join(line_text_parts).strip()
+                    if not stripped or stripped in _SKIP_EXACT or stripped.isdigit():
+                        continue
+                    formatted_text.append({
+                        "text": stripped,
+                        "bold": line_is_bold
+                    })
         return formatted_text
 
     def _flexible_enhancement_match(self, line_text: str):
         """
         Match enhancement lines like 'Control Enhancement: 4, 5, 6' with flexible patterns.
         """
-        patterns = [
-            r'^Control Enhancement:\s*(\d+(?:,\s*\d+)*)$',
-            r'^Control\s+Enhancement:\s*(\d+(?:,\s*\d+)*)$',
-            r'^Control\s*Enhancement\s*:\s*(\d+(?:,\s*\d+)*)$',
-            r'^Control Enhancement\s*:\s*(\d+(?:,\s*\d+)*).*$',
-            r'^Control Enhancement\s*:\s*(\d+(?:,\s*\d+)*)\s*$'
-        ]
-        for pattern in patterns:
-            match = re.match(pattern, line_text, re.IGNORECASE)
-            if match:
-                return match
-        return None
+        return self._ENH_RE.match(line_text)
 
     def _find_controls_and_attributes(self, formatted_text: List[dict], page_num: int):
         """
@@ -111,10 +168,13 @@ class ClassifiedControlExtractor:
         """
         for line_data in formatted_text:
             line_text = line_data["text"]
-            formats = line_data["formats"]
-            is_bold = any(fmt.get("bold", False) for fmt in formats)
+            is_bold = line_data["bold"]
             # Base control: e.g., "AC-3, ACCESS ENFORCEMENT"
-            base_control_match = re.match(r'^([A-Z]{2}-\d{1,2}),?\s*(.+)$', line_text)
+            base_control_match = None
+            if (len(line_text) >= 5 and
+                    'A' <= line_text[0] <= 'Z' and 'A' <= line_text[1] <= 'Z' and
+                    line_text[2] == '-'):
+                base_control_match = _BASE_CONTROL_RE.match(line_text)
             enhancement_match = self._flexible_enhancement_match(line_text)
             if base_control_match and is_bold:
                 control_id = base_control_match.group(1)
@@ -151,35 +211,37 @@ class ClassifiedControlExtractor:
                     # Append or set attribute
                     attrs = self.controls[self.current_control]["attributes"]
                     if attr_name in attrs:
-                        attrs[attr_name] += " " + attr_content.strip()
+                        attrs[attr_name].append(attr_content)
                     else:
-                        attrs[attr_name] = attr_content.strip()
+                        attrs[attr_name] = [attr_content]
                         self.current_attribute = attr_name
                     continue
             # Continuation of previous attribute
-            elif self.current_control and self.current_attribute and line_text.strip():
-                if not (base_control_match or enhancement_match or self._extract_attribute_from_line(line_text)):
+            # (enhancement lines were handled above and attribute lines need a ':',
+            # so only a non-bold base control line can still be excluded here;
+            # lines arrive stripped and non-empty from _extract_formatted_text)
+            elif self.current_control and self.current_attribute:
+                if not base_control_match:
                     attrs = self.controls[self.current_control]["attributes"]
-                    attrs[self.current_attribute] += " " + line_text.strip()
+                    attrs[self.current_attribute].append(line_text)
+
+    def _join_attributes(self):
+        """
+        Join the text parts collected for each attribute into a single string.
+        """
+        for control in self.controls.values():
+            attrs = control["attributes"]
+            for attr_name, parts in attrs.items():
+                attrs[attr_name] = " ".join(parts)
 
     def _extract_attribute_from_line(self, line_text: str):
         """
         If line starts with a known attribute, return (attribute_name, content).
+        All known attributes are matched in one pass by ``_ATTR_RE``.
         """
-        known_attributes = [
-            "Justification to Select",
-            "Supplemental Guidance",
-            "Parameter Value(s)",
-            "Parameter Value",
-            "Regulatory/Statutory Reference(s)",
-            "Control Extension",
-            "Control Extension(s)",
-            "Control Extension and Parameter Value(s)"
-        ]
-        for attr in known_attributes:
-            if line_text.startswith(attr + ":"):
-                content = line_text[len(attr) + 1:].strip()
-                return attr, content
+        match = self._ATTR_RE.match(line_text)
+        if match:
+            return match.group(1), line_text[match.end():].strip()
         return None
 
     def save_to_json(self, output_file: str):
@@ -187,8 +249,12 @@ class ClassifiedControlExtractor:
         Save extracted controls to a JSON file.
         """
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.controls, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(self.controls, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.controls, f, indent=2, ensure_ascii=False)
             print(f"\nSaved {len(self.controls)} controls to {output_file}")
         except Exception as e:
             print(f"Error saving to JSON: {e}")
@@ -225,15 +291,39 @@ class ClassifiedControlExtractor:
             else:
                 print(f"    Attributes: None found")
 
+@functools.lru_cache(maxsize=None)
+def _worker_document(pdf_path: str):
+    """Document handle opened once per worker process."""
+    return fitz.open(pdf_path)
+
+def _formatted_page_worker(args: Tuple[str, int]) -> Optional[List[dict]]:
+    """Process pool entry point: formatted text of one page."""
+    pdf_path, page_num = args
+    try:
+        page = _worker_document(pdf_path)[page_num]
+    except Exception as e:
+        return None
+    return ClassifiedControlExtractor._read_formatted_text(page)
+
 def main():
+    usage = "Usage: python classified_information_overlay_extractor.py <pdf_file> [--workers N]"
     if len(sys.argv) < 2:
-        print("Usage: python classified_information_overlay_extractor.py <pdf_file>")
+        print(usage)
         sys.exit(1)
     pdf_file = sys.argv[1]
     output_file = "extracted_classified_information_overlay.json"
+    options = sys.argv[2:]
+    # Pages are read in this process unless --workers N asks for a pool
+    workers = 1
+    if '--workers' in options:
+        index = options.index('--workers') + 1
+        if index == len(options) or not options[index].isdecimal() or int(options[index]) < 1:
+            print(usage)
+            sys.exit(1)
+        workers = int(options[index])
     print("Classified Information Overlay Control Extractor\n" + "=" * 50)
     extractor = ClassifiedControlExtractor(pdf_file)
-    controls = extractor.extract_controls()
+    controls = extractor.extract_controls(workers)
     if controls:
         extractor.save_to_json(output_file)
         extractor.print_summary()
@@ -13,13 +13,9 @@ def main():
     with open('extracted_classified_information_2022.json', 'r') as f:
         new_data = json.load(f)
     
-    # Get control sets
-    old_controls = set(old_data.keys())
-    new_controls = set(new_data.keys())
-    
-    # Calculate differences
-    removed = sorted(old_controls - new_controls)
-    added = sorted(new_controls - old_controls)
+    # Calculate differences directly on the key views
+    removed = sorted(old_data.keys() - new_data.keys())
+    added = sorted(new_data.keys() - old_data.keys())
     
     # Write summary
     with open('Classified_Information_version_change_summary.txt', 'w') as f:
@@ -27,11 +23,11 @@ def main():
         f.write("====================================================\n\n")
         
         f.write("STATISTICS:\n")
-        f.write(f"- Old version (based on NIST 800-53 Rev 4): {len(old_controls)} controls\n")
-        f.write(f"- New version (based on NIST 800-53 Rev 5): {len(new_controls)} controls\n")
+        f.write(f"- Old version (based on NIST 800-53 Rev 4): {len(old_data)} controls\n")
+        f.write(f"- New version (based on NIST 800-53 Rev 5): {len(new_data)} controls\n")
         f.write(f"- Controls removed: {len(removed)}\n")
         f.write(f"- Controls added: {len(added)}\n")
-        f.write(f"- Net change: {len(new_controls) - len(old_controls):+d} controls\n")
+        f.write(f"- Net change: {len(new_data) - len(old_data):+d} controls\n")
         
         f.write("\n\nCONTROLS REMOVED IN NEW VERSION:\n")
         f.write("---------------------------------\n")
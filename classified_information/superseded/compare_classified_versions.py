@@ -5,7 +5,10 @@ Shows differences in control selections between the two versions.
 """
 
 import json
-from collections import defaultdict
+from collections import Counter
+
+# Text fields extracted from the 2022 overlay
+NEW_FIELDS = ('justification', 'parameter_value', 'guidance', 'references')
 
 def load_old_classified():
     """Load the old Classified Information Overlay format."""
@@ -17,27 +20,31 @@ def load_new_classified():
     with open('extracted_classified_information_2022.json', 'r') as f:
         return json.load(f)
 
-def analyze_attributes(old_data, new_data):
-    """Analyze differences in control attributes between versions."""
-    # Count attribute types in old format
-    old_attrs = defaultdict(int)
-    for control in old_data.values():
-        for attr in control.get('attributes', {}):
-            old_attrs[attr] += 1
-    
-    # Count field types in new format
-    new_fields = defaultdict(int)
-    for control in new_data.values():
-        if control.get('justification'):
-            new_fields['justification'] += 1
-        if control.get('parameter_value'):
-            new_fields['parameter_value'] += 1
-        if control.get('guidance'):
-            new_fields['guidance'] += 1
-        if control.get('references'):
-            new_fields['references'] += 1
-    
-    return old_attrs, new_fields
+def tally_controls(old_data, new_data):
+    """Count families and attribute/field types and split control IDs by version, in one pass per version."""
+    old_families = Counter()
+    new_families = Counter()
+    old_attrs = Counter()
+    new_fields = Counter()
+    only_old = []
+    only_new = []
+    both = []
+    
+    for control_id, control in old_data.items():
+        old_families[control_id.split('-')[0]] += 1
+        old_attrs.update(control.get('attributes', {}).keys())
+        if control_id not in new_data:
+            only_old.append(control_id)
+    
+    for control_id, control in new_data.items():
+        new_families[control_id.split('-')[0]] += 1
+        new_fields.update(field for field in NEW_FIELDS if control.get(field))
+        if control_id in old_data:
+            both.append(control_id)
+        else:
+            only_new.append(control_id)
+    
+    return old_families, new_families, old_attrs, new_fields, only_old, only_new, both
 
 def main():
     print("=== Classified Information Overlay Version Comparison ===\n")
@@ -49,14 +56,10 @@ def main():
     print(f"Old version (Rev 4 based): {len(old_data)} controls")
     print(f"New version (Rev 5 based): {len(new_data)} controls")
     
-    # Get control sets
-    old_controls = set(old_data.keys())
-    new_controls = set(new_data.keys())
-    
-    # Find differences
-    only_old = old_controls - new_controls
-    only_new = new_controls - old_controls
-    both = old_controls & new_controls
+    # Split controls by version and tally families and attributes
+    (old_families, new_families, old_attrs, new_fields,
+     only_old, only_new, both) = tally_controls(old_data, new_data)
+    new_controls = set(new_data.keys())  # for the prefix search below
     
     print(f"\n=== Control Coverage ===")
     print(f"Controls in both versions: {len(both)}")
@@ -82,7 +85,6 @@ def main():
     
     # Analyze attributes
     print("\n=== Attribute/Field Analysis ===")
-    old_attrs, new_fields = analyze_attributes(old_data, new_data)
     
     print("\nOld version attribute types:")
     for attr, count in sorted(old_attrs.items()):
@@ -105,10 +107,10 @@ def main():
         print(f"  New name: {new_control.get('name', 'N/A')}")
         
         # Compare attributes
-        old_attrs = old_control.get('attributes', {})
-        if old_attrs:
+        control_attrs = old_control.get('attributes', {})
+        if control_attrs:
             print("  Old attributes:")
-            for attr, value in old_attrs.items():
+            for attr, value in control_attrs.items():
                 if value:
                     print(f"    {attr}: {str(value)[:60]}...")
         
@@ -124,18 +126,7 @@ def main():
     
     # Count families
     print("\n=== Control Family Distribution ===")
-    old_families = defaultdict(int)
-    new_families = defaultdict(int)
-    
-    for control_id in old_controls:
-        family = control_id.split('-')[0]
-        old_families[family] += 1
-    
-    for control_id in new_controls:
-        family = control_id.split('-')[0]
-        new_families[family] += 1
-    
-    all_families = sorted(set(old_families.keys()) | set(new_families.keys()))
+    all_families = sorted(old_families.keys() | new_families.keys())
     
     print("\nFamily | Old | New | Diff")
     print("-------|-----|-----|-----")
@@ -146,7 +137,7 @@ def main():
         diff_str = f"+{diff}" if diff > 0 else str(diff)
         print(f"{family:6} | {old_count:3} | {new_count:3} | {diff_str:4}")
     
-    print(f"\nTotal  | {len(old_controls):3} | {len(new_controls):3} | {len(new_controls) - len(old_controls):+4}")
+    print(f"\nTotal  | {len(old_data):3} | {len(new_data):3} | {len(new_data) - len(old_data):+4}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
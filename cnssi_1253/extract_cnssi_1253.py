@@ -2,20 +2,143 @@
 """
 Extract CNSSI 1253 2022 overlay data from PDF using table extraction.
 Final version: Uses range-based column detection for robust extraction.
+
+Usage:
+    python extract_cnssi_1253.py <pdf_path>
+    python extract_cnssi_1253.py <pdf_path> --debug-page N
+    python extract_cnssi_1253.py <pdf_path> --workers N
 """
 
 import fitz
+import functools
 import json
+import multiprocessing
 import re
 import sys
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson  # Optional faster JSON encoder
+except ImportError:
+    orjson = None
+
+# A whole table cell holding a control ID, e.g. "AC-2" or "AC-2(1)"
+_CONTROL_ID_RE = re.compile(r'^[A-Z]{2}-\d+(?:\(\d+\))?$')
+
+# Any control ID in the page text; pages without one hold no control table
+_PAGE_CONTROL_RE = re.compile(r'[A-Z]{2}-\d+')
+
+# Header letters -> selection keys
+_CIA_FIELDS = {'C': 'confidentiality', 'I': 'integrity', 'A': 'availability'}
+_LEVEL_FIELDS = {'L': 'low', 'M': 'moderate', 'H': 'high'}
+
+# Selections are packed into a 9-bit mask while parsing, one bit per
+# (objective, level), and unpacked by _mask_to_dict() for output
+_SELECTION_BITS = {
+    (objective, level): 1 << (3 * i + j)
+    for i, objective in enumerate(_CIA_FIELDS.values())
+    for j, level in enumerate(_LEVEL_FIELDS.values())
+}
+_INTEGRITY_ALL = (_SELECTION_BITS['integrity', 'low'] |
+                  _SELECTION_BITS['integrity', 'moderate'] |
+                  _SELECTION_BITS['integrity', 'high'])
+
+# Cell values that mark a selected impact level
+_MARK_SET = frozenset({'X', '+'})
+
+# Cell values that are not a justification or parameter value
+_NOT_TEXT_SET = frozenset({'', 'None', 'X', '+'})
+
+# Hardcoded special text for the PM (Program Management) and PT (PII) families
+_SPECIAL_CASE_TEXT = {
+    'PM': "Deployed organization-wide. Supports information security program. Not associated with security control baselines. Independent of any system impact level.",
+    'PT': "Personally Identifiable Information Processing and Transparency control are not allocated to the security control baselines.",
+}
+
+def _mask_to_dict(mask: int, special_text: Optional[str] = None) -> Dict:
+    """Unpack a selection mask into the nested selections dict of the output."""
+    selections = {
+        objective: {level: bool(mask & _SELECTION_BITS[objective, level])
+                    for level in _LEVEL_FIELDS.values()}
+        for objective in _CIA_FIELDS.values()
+    }
+    if special_text:
+        selections['special_text'] = special_text
+    return selections
+
+class ControlRecord(NamedTuple):
+    """One parsed control row; 'selections' is the packed selection mask."""
+    control_id: str
+    title: str
+    selected: bool
+    selections: int
+    parameter_value: Optional[str]
+    justification: Optional[str]
+    withdrawn: bool = False
+    
+    def has_data(self) -> bool:
+        """True if the row marks any impact level or carries a parameter value or justification."""
+        return bool(self.selections or self.parameter_value or self.justification)
+    
+    def to_dict(self) -> Dict:
+        """Build the output record, unpacking the selections."""
+        result = {
+            'control_id': self.control_id,
+            'title': self.title,
+            'selected': self.selected,
+            'selections': _mask_to_dict(self.selections,
+                                        _SPECIAL_CASE_TEXT.get(self.control_id.split('-')[0])),
+            'parameter_value': self.parameter_value,
+            'justification': self.justification
+        }
+        
+        # Add withdrawn field if applicable
+        if self.withdrawn:
+            result['withdrawn'] = True
+        
+        return result
+
+# SC-18(2) and SC-18(3) on page 136 are split over a continuation table that
+# cannot be parsed reliably, so they are hardcoded
+_SC18_CONTINUATION_CONTROLS = (
+    ControlRecord(
+        control_id='SC-18(2)',
+        title='Acquisition, Development, and Use',
+        selected=True,
+        selections=_INTEGRITY_ALL,
+        parameter_value='the following requirements:\n(a) Category 1A mobile code where technologies can differentiate between signed and unsigned mobile code and block execution of unsigned mobile code may be used.\n(b) Category 2 mobile code allowing mediated or controlled access to workstation, server, and remote system services and resources may be used with appropriate protections (e.g., executes in a constrained environment without access to system resources such as Windows registry, file system, system parameters, and network connections to other than the originating host; does not execute in a constrained environment unless obtained from a trusted source over an assured channel).\n(c) Category 3 mobile code having limited functionality, with no capability for unmediated access to workstation, server, and remote system services and resources may be used when executing in an approved browser.',
+        justification='NSS Best Practice'
+    ),
+    ControlRecord(
+        control_id='SC-18(3)',
+        title='Prevent Downloading and Execution',
+        selected=True,
+        selections=_INTEGRITY_ALL,
+        parameter_value='all unacceptable mobile code such as:\n(a) Emerging mobile code technologies that have not undergone a risk assessment and been assigned to a Risk Category by the CIO.\n(b) Category 1X mobile code technologies and implementations that cannot differentiate between signed and unsigned mobile code.\n(c) Unsigned Category 1A mobile code.\n(d) Category 2 mobile code not obtained from a trusted source over an assured channel (e.g., SIPRNet, SSL connection, S/MIME, code is signed with an approved code signing certificate).',
+        justification='NSS Best Practice'
+    ),
+)
 
 class TableStructure:
     """Stores the column ranges for impact levels."""
+    __slots__ = ('ranges', 'justification_col', 'param_value_col')
+    
     def __init__(self):
         self.ranges = {}  # e.g., {'C-L': (11, 13), 'C-M': (14, 16), ...}
         self.justification_col = None
         self.param_value_col = None
+    
+    def build_col_map(self, ncols: int) -> List[int]:
+        """Map each column index to its selection mask bit, or 0 outside all ranges.
+        Where ranges overlap, the first range (in detection order) wins."""
+        col_map = [0] * ncols
+        for range_name, (start, end) in self.ranges.items():
+            cia, level = range_name.split('-')
+            bit = _SELECTION_BITS[_CIA_FIELDS[cia], _LEVEL_FIELDS[level]]
+            for col in range(max(start, 0), min(end + 1, ncols)):
+                if not col_map[col]:
+                    col_map[col] = bit
+        return col_map
 
 def detect_table_structure(header_rows: List[List]) -> TableStructure:
     """Detect column ranges from header rows."""
@@ -41,21 +164,16 @@ def detect_table_structure(header_rows: List[List]) -> TableStructure:
         cia_idx = 0
         level_count = 0
         
-        for col, level in lmh_positions:
+        # Each range ends just before the next L/M/H position (positions are in
+        # column order); the last one gets a range of 2
+        ends = [next_col - 1 for next_col, _ in lmh_positions[1:]]
+        if lmh_positions:
+            ends.append(lmh_positions[-1][0] + 2)
+        
+        for (col, level), end_col in zip(lmh_positions, ends):
             if cia_idx < len(cia_list):
                 cia = cia_list[cia_idx]
                 
-                # Find the end of the range
-                # Look for the next L/M/H position
-                end_col = col
-                for j, (next_col, next_level) in enumerate(lmh_positions):
-                    if next_col > col:
-                        end_col = next_col - 1
-                        break
-                else:
-                    # Last one - give it a range of 2
-                    end_col = col + 2
-                
                 structure.ranges[f'{cia}-{level}'] = (col, end_col)
                 
                 # Move to next CIA after 3 levels
@@ -76,99 +194,68 @@ def detect_table_structure(header_rows: List[List]) -> TableStructure:
     
     return structure
 
-def parse_control_row(row: List, structure: TableStructure) -> Optional[Dict]:
-    """Parse a single row from the control table."""
+def parse_control_row(row: List, structure: TableStructure,
+                      col_map: Optional[List[int]] = None) -> Optional[ControlRecord]:
+    """Parse a single row from the control table.
+    `col_map` is structure.build_col_map() for the table, built per row if omitted."""
     if not row or len(row) < 10:
         return None
     
-    # Check if this is a withdrawn control
-    is_withdrawn = any(cell and 'Withdrawn' in str(cell) for cell in row)
-    
-    # Don't skip withdrawn controls - process them
-    
-    # Find control ID - check first few columns
+    # Walk the row once: withdrawn flag, control ID (in the first few columns),
+    # title (next non-empty cell within four columns of the ID) and marked cells.
+    # Withdrawn controls are not skipped - they are processed like the others.
+    # Stripped cell strings are kept in `cells` ('' for empty cells) for reuse.
+    is_withdrawn = False
     control_id = ""
     control_col_idx = 0
-    for i in range(min(4, len(row))):
-        if row[i]:
-            potential_id = str(row[i]).strip()
-            if re.match(r'^[A-Z]{2}-\d+(\(\d+\))?$', potential_id):
-                control_id = potential_id
-                control_col_idx = i
-                break
+    title = ""
+    marked_cols = []
+    cells = [''] * len(row)
+    for col_idx, cell in enumerate(row):
+        if not cell:
+            continue
+        cell_str = str(cell)
+        if 'Withdrawn' in cell_str:
+            is_withdrawn = True
+        cell_str = cells[col_idx] = cell_str.strip()
+        if not control_id:
+            if col_idx < 4 and _CONTROL_ID_RE.match(cell_str):
+                control_id = cell_str
+                control_col_idx = col_idx
+        elif not title and cell_str and col_idx <= control_col_idx + 4:
+            title = cell_str
+        if cell_str in _MARK_SET:
+            marked_cols.append(col_idx)
     
     if not control_id:
         return None
     
-    # Extract title - look in next few columns after control ID
-    title = ""
-    for offset in range(1, 5):
-        idx = control_col_idx + offset
-        if idx < len(row) and row[idx] and str(row[idx]).strip():
-            title = str(row[idx]).strip()
-            break
-    
     # Check for special PM (Program Management) and PT (PII) families
     family = control_id.split('-')[0]
-    special_case_text = None
     
-    # Hardcode special text for PM and PT families
-    if family == 'PM':
-        special_case_text = "Deployed organization-wide. Supports information security program. Not associated with security control baselines. Independent of any system impact level."
-    elif family == 'PT':
-        special_case_text = "Personally Identifiable Information Processing and Transparency control are not allocated to the security control baselines."
-    
-    # Initialize selections
-    selections = {
-        'confidentiality': {'low': False, 'moderate': False, 'high': False},
-        'integrity': {'low': False, 'moderate': False, 'high': False},
-        'availability': {'low': False, 'moderate': False, 'high': False}
-    }
-    
-    # Check for marks using ranges
-    def is_selected(val):
-        if val is None:
-            return False
-        val_str = str(val).strip()
-        return val_str in ['X', '+']
-    
-    # Check each cell against our ranges
-    for col_idx, cell in enumerate(row):
-        if is_selected(cell):
-            # Find which range this column falls into
-            for range_name, (start, end) in structure.ranges.items():
-                if start <= col_idx <= end:
-                    # Parse range name (e.g., 'C-L' -> confidentiality, low)
-                    cia, level = range_name.split('-')
-                    cia_map = {'C': 'confidentiality', 'I': 'integrity', 'A': 'availability'}
-                    level_map = {'L': 'low', 'M': 'moderate', 'H': 'high'}
-                    
-                    if cia in cia_map and level in level_map:
-                        selections[cia_map[cia]][level_map[level]] = True
-                    break
+    # Map marked cells to impact levels using our ranges
+    if col_map is None:
+        col_map = structure.build_col_map(len(row))
+    mask = 0
+    for col_idx in marked_cols:
+        if col_idx < len(col_map):
+            mask |= col_map[col_idx]
     
     # Extract justification and parameter value
     justification = None
     if structure.justification_col and structure.justification_col < len(row):
-        cell = row[structure.justification_col]
-        if cell:
-            just_str = str(cell).strip()
-            if just_str and just_str not in ['', 'None', 'X', '+']:
-                justification = just_str
+        just_str = cells[structure.justification_col]
+        if just_str not in _NOT_TEXT_SET:
+            justification = just_str
     
     parameter_value = None
     if structure.param_value_col and structure.param_value_col < len(row):
-        cell = row[structure.param_value_col]
-        if cell:
-            param_str = str(cell).strip()
-            if param_str and param_str not in ['', 'None', 'X', '+']:
-                parameter_value = param_str
+        param_str = cells[structure.param_value_col]
+        if param_str not in _NOT_TEXT_SET:
+            parameter_value = param_str
     
     # Determine if control is selected
-    selected = any(
-        any(level for level in objective.values())
-        for objective in selections.values()
-    )
+    selected = mask != 0
     
     # Special case handling for PM and PT families
     if family == 'PM':
@@ -182,35 +269,30 @@ def parse_control_row(row: List, structure: TableStructure) -> Optional[Dict]:
     if is_withdrawn:
         selected = False
     
-    # Add special case text to selections if applicable
-    if special_case_text:
-        selections['special_text'] = special_case_text
-    
-    result = {
-        'control_id': control_id,
-        'title': title,
-        'selected': selected,
-        'selections': selections,
-        'parameter_value': parameter_value,
-        'justification': justification
-    }
-    
-    # Add withdrawn field if applicable
-    if is_withdrawn:
-        result['withdrawn'] = True
-    
-    return result
+    return ControlRecord(control_id, title, selected, mask,
+                         parameter_value, justification, is_withdrawn)
 
-def extract_controls_from_page(page, prev_structure=None) -> Tuple[List[Dict], TableStructure]:
+def extract_controls_from_page(page, prev_structure=None) -> Tuple[List[ControlRecord], TableStructure]:
     """Extract control data from a single page using table extraction.
-    Returns controls and the last table structure for use with continuation tables."""
+    Returns control records and the last table structure for use with continuation tables."""
+    return extract_controls_from_tables(read_page_tables(page), prev_structure)
+
+def read_page_tables(page) -> List[List[List]]:
+    """Find the tables on a page and return the extracted cell rows of each.
+    
+    The control tables are fully ruled, so only vector lines are used for
+    cell borders ("lines_strict"); the default strategy also tries to infer
+    borders from text layout, which is slower and splits the multi-line
+    titles of withdrawn controls across two rows."""
+    return [table.extract() for table in page.find_tables(strategy="lines_strict")]
+
+def extract_controls_from_tables(tables: List[List[List]], prev_structure=None) -> Tuple[List[ControlRecord], TableStructure]:
+    """Extract control data from the extracted tables of a single page.
+    Returns control records and the last table structure for use with continuation tables."""
     controls = []
     last_structure = prev_structure
     
-    tables = page.find_tables()
-    for table in tables:
-        extracted = table.extract()
-        
+    for extracted in tables:
         if len(extracted) < 4:  # Might be a continuation table
             # If we have a previous structure and this looks like control data
             if prev_structure and len(extracted) > 0:
@@ -218,7 +300,7 @@ def extract_controls_from_page(page, prev_structure=None) -> Tuple[List[Dict], T
                 has_control = False
                 for row in extracted:
                     for cell in row[:3]:  # Check first 3 columns
-                        if cell and re.match(r'^[A-Z]{2}-\d+(\(\d+\))?$', str(cell).strip()):
+                        if cell and _CONTROL_ID_RE.match(str(cell).strip()):
                             has_control = True
                             break
                     if has_control:
@@ -234,39 +316,13 @@ def extract_controls_from_page(page, prev_structure=None) -> Tuple[List[Dict], T
                             break
                     
                     if is_page_136_continuation:
-                        # Hardcode SC-18(2) and SC-18(3) due to complex table continuation
-                        hardcoded_controls = [
-                            {
-                                'control_id': 'SC-18(2)',
-                                'title': 'Acquisition, Development, and Use',
-                                'selected': True,
-                                'selections': {
-                                    'confidentiality': {'low': False, 'moderate': False, 'high': False},
-                                    'integrity': {'low': True, 'moderate': True, 'high': True},
-                                    'availability': {'low': False, 'moderate': False, 'high': False}
-                                },
-                                'parameter_value': 'the following requirements:\n(a) Category 1A mobile code where technologies can differentiate between signed and unsigned mobile code and block execution of unsigned mobile code may be used.\n(b) Category 2 mobile code allowing mediated or controlled access to workstation, server, and remote system services and resources may be used with appropriate protections (e.g., executes in a constrained environment without access to system resources such as Windows registry, file system, system parameters, and network connections to other than the originating host; does not execute in a constrained environment unless obtained from a trusted source over an assured channel).\n(c) Category 3 mobile code having limited functionality, with no capability for unmediated access to workstation, server, and remote system services and resources may be used when executing in an approved browser.',
-                                'justification': 'NSS Best Practice'
-                            },
-                            {
-                                'control_id': 'SC-18(3)',
-                                'title': 'Prevent Downloading and Execution',
-                                'selected': True,
-                                'selections': {
-                                    'confidentiality': {'low': False, 'moderate': False, 'high': False},
-                                    'integrity': {'low': True, 'moderate': True, 'high': True},
-                                    'availability': {'low': False, 'moderate': False, 'high': False}
-                                },
-                                'parameter_value': 'all unacceptable mobile code such as:\n(a) Emerging mobile code technologies that have not undergone a risk assessment and been assigned to a Risk Category by the CIO.\n(b) Category 1X mobile code technologies and implementations that cannot differentiate between signed and unsigned mobile code.\n(c) Unsigned Category 1A mobile code.\n(d) Category 2 mobile code not obtained from a trusted source over an assured channel (e.g., SIPRNet, SSL connection, S/MIME, code is signed with an approved code signing certificate).',
-                                'justification': 'NSS Best Practice'
-                            }
-                        ]
-                        
-                        controls.extend(hardcoded_controls)
+                        # Hardcoded SC-18(2) and SC-18(3) due to complex table continuation
+                        controls.extend(_SC18_CONTINUATION_CONTROLS)
                     else:
                         # Normal continuation table processing
+                        col_map = prev_structure.build_col_map(max(len(row) for row in extracted))
                         for row in extracted:
-                            control_data = parse_control_row(row, prev_structure)
+                            control_data = parse_control_row(row, prev_structure, col_map)
                             if control_data:
                                 controls.append(control_data)
             continue
@@ -276,83 +332,143 @@ def extract_controls_from_page(page, prev_structure=None) -> Tuple[List[Dict], T
         last_structure = structure
         
         # Process data rows (skip headers)
+        col_map = structure.build_col_map(max(len(row) for row in extracted))
         for row in extracted[3:]:
-            control_data = parse_control_row(row, structure)
+            control_data = parse_control_row(row, structure, col_map)
             if control_data:
                 controls.append(control_data)
     
     return controls, last_structure
 
-def extract_cnssi_1253_2022(pdf_path: str, debug_page: Optional[int] = None) -> Dict[str, Dict]:
-    """Extract all CNSSI 1253 2022 overlay data from the PDF."""
-    doc = fitz.open(pdf_path)
+def _read_candidate_page(page) -> Optional[List[List[List]]]:
+    """Return the extracted tables of a page, or None for pages without control tables."""
+    text = page.get_text()
+    if "Table D-" not in text and not _PAGE_CONTROL_RE.search(text):
+        return None
+    return read_page_tables(page)
+
+@functools.lru_cache(maxsize=None)
+def _worker_document(pdf_path: str):
+    """Document handle opened once per worker process."""
+    return fitz.open(pdf_path, filetype="pdf")
+
+def _candidate_page_worker(args: Tuple[str, int]) -> Optional[List[List[List]]]:
+    """Process pool entry point for _read_candidate_page()."""
+    pdf_path, page_index = args
+    return _read_candidate_page(_worker_document(pdf_path).load_page(page_index))
+
+def _debug_dump(control: Dict):
+    """Print one extracted control for --debug-page."""
+    control_id = control['control_id']
+    print(f"Found control: {control_id} - {control['title']}")
+    print(f"  Selected: {control['selected']}")
+    print(f"  C: L={control['selections']['confidentiality']['low']}, "
+          f"M={control['selections']['confidentiality']['moderate']}, "
+          f"H={control['selections']['confidentiality']['high']}")
+    print(f"  I: L={control['selections']['integrity']['low']}, "
+          f"M={control['selections']['integrity']['moderate']}, "
+          f"H={control['selections']['integrity']['high']}")
+    print(f"  A: L={control['selections']['availability']['low']}, "
+          f"M={control['selections']['availability']['moderate']}, "
+          f"H={control['selections']['availability']['high']}")
+    if control.get('withdrawn'):
+        print(f"  WITHDRAWN")
+    if control['parameter_value']:
+        print(f"  Parameter: {control['parameter_value']}")
+    if control['justification']:
+        print(f"  Justification: {control['justification']}")
+
+def extract_cnssi_1253_2022(pdf_path: str, debug_page: Optional[int] = None,
+                            workers: Optional[int] = 1) -> Dict[str, Dict]:
+    """Extract all CNSSI 1253 2022 overlay data from the PDF.
+    
+    Table detection runs in this process by default, and always for a debug
+    page; `workers` > 1 uses a pool of that many processes and None one per
+    CPU. The extracted tables are parsed here in page order, since
+    continuation tables reuse the column structure of the previous page."""
+    doc = fitz.open(pdf_path, filetype="pdf")
     all_controls = {}
     
     # Tables start around page 25 (D-4)
     start_page = 24  # 0-indexed
     
     if debug_page:
-        pages = [doc[debug_page - 1]]
+        page_indexes = [debug_page - 1]
     else:
-        pages = doc[start_page:]
+        page_indexes = range(start_page, len(doc))
     
-    prev_structure = None
-    for page in pages:
-        page_num = page.number + 1
-        
-        # Skip pages without control tables
-        text = page.get_text()
-        if "Table D-" not in text and not re.search(r'[A-Z]{2}-\d+', text):
-            continue
+    pool = None
+    if debug_page or workers == 1:
+        page_tables = (_read_candidate_page(doc.load_page(page_index)) for page_index in page_indexes)
+    else:
+        # Each worker opens its own handle; documents are not shared across processes
+        doc.close()
+        pool = multiprocessing.Pool(workers)
+        page_tables = pool.imap(_candidate_page_worker, [(pdf_path, page_index) for page_index in page_indexes])
+    
+    try:
+        prev_structure = None
+        for page_index, tables in zip(page_indexes, page_tables):
+            # Skip pages without control tables
+            if tables is None:
+                continue
             
-        print(f"Processing page {page_num}...")
-        
-        controls, prev_structure = extract_controls_from_page(page, prev_structure)
-        for control in controls:
-            control_id = control['control_id']
-            all_controls[control_id] = control
+            page_num = page_index + 1
+            print(f"Processing page {page_num}...")
+            
+            records, prev_structure = extract_controls_from_tables(tables, prev_structure)
+            # A control ID seen on an earlier page keeps its record unless the
+            # repeat actually carries data
+            controls = [record.to_dict() for record in records
+                        if record.control_id not in all_controls or record.has_data()]
+            all_controls.update({control['control_id']: control for control in controls})
             
             if debug_page:
-                print(f"Found control: {control_id} - {control['title']}")
-                print(f"  Selected: {control['selected']}")
-                print(f"  C: L={control['selections']['confidentiality']['low']}, "
-                      f"M={control['selections']['confidentiality']['moderate']}, "
-                      f"H={control['selections']['confidentiality']['high']}")
-                print(f"  I: L={control['selections']['integrity']['low']}, "
-                      f"M={control['selections']['integrity']['moderate']}, "
-                      f"H={control['selections']['integrity']['high']}")
-                print(f"  A: L={control['selections']['availability']['low']}, "
-                      f"M={control['selections']['availability']['moderate']}, "
-                      f"H={control['selections']['availability']['high']}")
-                if control.get('withdrawn'):
-                    print(f"  WITHDRAWN")
-                if control['parameter_value']:
-                    print(f"  Parameter: {control['parameter_value']}")
-                if control['justification']:
-                    print(f"  Justification: {control['justification']}")
-    
-    doc.close()
+                for control in controls:
+                    _debug_dump(control)
+    finally:
+        if pool is not None:
+            pool.terminate()
+        else:
+            doc.close()
+    
     return all_controls
 
 def main():
+    usage = "Usage: python extract_cnssi_1253.py <pdf_path> [--debug-page N] [--workers N]"
     if len(sys.argv) < 2:
-        print("Usage: python extract_cnssi_1253.py <pdf_path> [--debug-page N]")
+        print(usage)
         sys.exit(1)
     
     pdf_path = sys.argv[1]
     debug_page = None
     
-    if len(sys.argv) > 2 and sys.argv[2] == '--debug-page':
-        debug_page = int(sys.argv[3])
+    options = sys.argv[2:]
+    for option, value in zip(options[::2], options[1::2]):
+        if option == '--debug-page':
+            debug_page = int(value)
+    
+    # Pages are read in this process unless --workers N asks for a pool
+    workers = 1
+    if '--workers' in options:
+        index = options.index('--workers') + 1
+        if index == len(options) or not options[index].isdecimal() or int(options[index]) < 1:
+            print(usage)
+            sys.exit(1)
+        workers = int(options[index])
     
     print(f"Extracting CNSSI 1253 2022 data from {pdf_path}...")
-    controls = extract_cnssi_1253_2022(pdf_path, debug_page)
+    controls = extract_cnssi_1253_2022(pdf_path, debug_page, workers)
     
     if not debug_page:
         # Save to JSON
         output_path = 'extracted_cnssi_1253.json'
-        with open(output_path, 'w') as f:
-            json.dump(controls, f, indent=2)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(controls, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(controls, f, indent=2, ensure_ascii=False)
         
         print(f"\nExtraction complete!")
         print(f"Total controls extracted: {len(controls)}")
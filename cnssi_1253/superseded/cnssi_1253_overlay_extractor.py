@@ -7,10 +7,77 @@ The PDF contains a table format with columns: ID, Control Text, and Defined Valu
 """
 
 import fitz  # PyMuPDF
+import functools
+import itertools
 import json
+import multiprocessing
 import re
 import sys
-from typing import Dict, List, Tuple, Optional
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+try:
+    import orjson  # Optional faster JSON encoder
+except ImportError:
+    orjson = None
+
+# Text dict flags without image blocks, which the parser ignores anyway
+_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Base control IDs such as AC-2 (group 1) or enhancement IDs such as AC-2(4) (group 2)
+_CONTROL_ID_RE = re.compile(r'\b([A-Z]{2}-\d{1,2})\b(?!\(\d+\))|([A-Z]{2}-\d{1,2}\(\d+\))')
+# Appendix page numbers such as E-12
+_PAGE_LABEL_RE = re.compile(r'^[A-Z]-\d+$')
+
+# Page and table headers repeated on every page
+_HEADER_TEXTS = frozenset({"CNSSI No. 1253", "Control Text", "Defined Value for NSS"})
+
+# Span texts up to this length are interned; short texts are mostly repeated headers and values
+_INTERN_MAX_LEN = 40
+
+# Defined values that would otherwise land in the control text column
+_DV_PREFIXES = ("Not appropriate to define", "At least annually", "Not to exceed",
+                "all NSS", "all organizations operating NSS")
+_DV_EXACT = frozenset({"All", "Disables", "3", "15 minutes", "30 minutes"})
+
+def _find_control_id(text: str) -> Optional[Tuple[str, bool]]:
+    """Return (control_id, is_enhancement) for text, preferring any enhancement ID over a base ID."""
+    base_id = None
+    for match in _CONTROL_ID_RE.finditer(text):
+        if match.group(2):
+            return match.group(2), True
+        if base_id is None:
+            base_id = match.group(1)
+    return (base_id, False) if base_id else None
+
+def _is_noise(text: str) -> bool:
+    """Return True for page headers, table headers and page numbers that precede continued content."""
+    return (len(text) < 3 or
+            text in _HEADER_TEXTS or
+            "CNSSI No. 1253" in text or
+            "Control Text" in text or
+            "Defined Value for NSS" in text or
+            "Table E-1" in text or
+            # Bare page numbers, or page labels such as E-12 (always '-' second)
+            text.isdecimal() or
+            (text[1] == '-' and _PAGE_LABEL_RE.match(text) is not None))
+
+def _is_defined_value(text: str) -> bool:
+    """Better content detection for defined values that start left of the defined value column."""
+    return text in _DV_EXACT or text.startswith(_DV_PREFIXES)
+
+class TextSpan(NamedTuple):
+    """One non-empty text span; y0 is rounded to 0.1pt so spans on a line sort by x0."""
+    y0: float
+    x0: float
+    x1: float
+    y1: float
+    text: str
+    page: int
+
+# Reading-order sort key for spans
+_SPAN_ORDER = itemgetter(0, 1)
 
 class CNSSI1253Extractor:
     def __init__(self, pdf_path: str):
@@ -19,21 +86,37 @@ class CNSSI1253Extractor:
         self.debug_mode = False
         self.current_control_id = None
         self.current_control_elements = []
+        self.current_continuation_elements = []
+        
+    def extract_controls(self, workers: Optional[int] = 1) -> Dict:
+        """Extract all controls from the PDF document.
         
-    def extract_controls(self) -> Dict:
-        """Extract all controls from the PDF document."""
+        Page spans are read in this process by default; `workers` > 1 uses a
+        pool of that many processes and None one per CPU. Spans are merged here
+        in page order, since controls continue across pages."""
         try:
             doc = fitz.open(self.pdf_path)
-            print(f"Processing {len(doc)} pages...")
+            page_count = len(doc)
+            print(f"Processing {page_count} pages...")
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                self._process_page(page, page_num + 1)
+            if workers == 1:
+                for page_num in range(page_count):
+                    page = doc[page_num]
+                    self._process_page(page, page_num + 1)
+                doc.close()
+            else:
+                # Each worker opens its own handle; documents are not shared across processes
+                doc.close()
+                with multiprocessing.Pool(workers) as pool:
+                    pages = pool.imap(_page_spans_worker,
+                                      [(self.pdf_path, page_num) for page_num in range(page_count)])
+                    for page_num, page_elements in enumerate(pages, 1):
+                        self._process_page_spans(page_elements, page_num)
             
             if self.current_control_elements:
-                self._finalize_current_control(len(doc))
+                self._finalize_current_control(page_count)
+            self._join_text_parts()
                 
-            doc.close()
             return self.controls
             
         except Exception as e:
@@ -42,12 +125,20 @@ class CNSSI1253Extractor:
     
     def _process_page(self, page, page_num: int):
         """Process a single page, handling controls that span multiple pages."""
+        try:
+            page_elements = self._extract_text_elements(page, page_num)
+        except Exception as e:
+            page_elements = e
+        self._process_page_spans(page_elements, page_num)
+    
+    def _process_page_spans(self, page_elements, page_num: int):
+        """Process the spans of a single page, or report the error raised while reading them."""
         try:
             if self.debug_mode:
                 print(f"\n=== Processing Page {page_num} ===")
             
-            text_dict = page.get_text("dict")
-            page_elements = self._extract_text_elements(text_dict, page_num)
+            if isinstance(page_elements, Exception):
+                raise page_elements
             self._process_page_elements(page_elements, page_num)
                 
         except Exception as e:
@@ -56,9 +147,11 @@ class CNSSI1253Extractor:
                 import traceback
                 traceback.print_exc()
     
-    def _extract_text_elements(self, text_dict: dict, page_num: int) -> List[Dict]:
-        """Extract text elements from a page."""
+    @staticmethod
+    def _extract_text_elements(page, page_num: int) -> List[TextSpan]:
+        """Extract text spans from a page in reading order."""
         text_elements = []
+        text_dict = page.get_text("dict", flags=_DICT_FLAGS)
         
         for block in text_dict.get("blocks", []):
             if block.get("type") == 0:
@@ -66,41 +159,31 @@ class CNSSI1253Extractor:
                     for span in line.get("spans", []):
                         text = span.get("text", "").strip()
                         if text:
-                            bbox = span.get("bbox", [0, 0, 0, 0])
-                            x0, y0, x1, y1 = bbox
-                            
-                            text_elements.append({
-                                "text": text,
-                                "x0": x0,
-                                "y0": y0,
-                                "x1": x1,
-                                "y1": y1,
-                                "font": span.get("font", ""),
-                                "flags": span.get("flags", 0),
-                                "page": page_num
-                            })
+                            if len(text) <= _INTERN_MAX_LEN:
+                                text = sys.intern(text)
+                            x0, y0, x1, y1 = span.get("bbox", (0, 0, 0, 0))
+                            text_elements.append(TextSpan(round(y0, 1), x0, x1, y1, text, page_num))
         
-        text_elements.sort(key=lambda x: (round(x["y0"], 1), x["x0"]))
+        text_elements.sort(key=_SPAN_ORDER)
         return text_elements
     
-    def _process_page_elements(self, page_elements: List[Dict], page_num: int):
+    def _process_page_elements(self, page_elements: List[TextSpan], page_num: int):
         """Process elements from a page, handling cross-page controls."""
         if self.debug_mode:
             print(f"    Analyzing {len(page_elements)} text elements on page {page_num}")
         
         control_ids_found = []
         for i, element in enumerate(page_elements):
-            element_text = element["text"]
+            element_text = element.text
             
-            enhancement_match = re.search(r'([A-Z]{2}-\d{1,2}\(\d+\))', element_text)
-            base_control_match = re.search(r'\b([A-Z]{2}-\d{1,2})\b(?!\(\d+\))', element_text)
+            id_match = _find_control_id(element_text)
             
-            if enhancement_match or base_control_match:
-                found_id = enhancement_match.group(1) if enhancement_match else base_control_match.group(1)
+            if id_match:
+                found_id, is_enhancement = id_match
                 control_ids_found.append((i, found_id, element))
                 
                 if self.debug_mode:
-                    control_type = "ENHANCEMENT" if enhancement_match else "BASE"
+                    control_type = "ENHANCEMENT" if is_enhancement else "BASE"
                     print(f"    Element {i}: Found {control_type} ID '{found_id}' in text: '{element_text}'")
         
         if self.debug_mode:
@@ -108,28 +191,16 @@ class CNSSI1253Extractor:
         
         # Handle continuation content
         if control_ids_found and control_ids_found[0][0] > 0 and self.current_control_id:
-            continuation_elements = page_elements[:control_ids_found[0][0]]
-            
             valid_continuation = []
-            for elem in continuation_elements:
-                elem_text = elem["text"].strip()
-                if not (("CNSSI No. 1253" in elem_text) or 
-                       ("Control Text" in elem_text) or
-                       ("Defined Value for NSS" in elem_text) or
-                       ("Table E-1" in elem_text) or
-                       ("Appendix" in elem_text.upper()) or
-                       (re.match(r'^[A-Z]-\d+$', elem_text)) or
-                       (re.match(r'^\d+$', elem_text)) or
-                       (len(elem_text) < 3)):
+            for elem in itertools.islice(page_elements, control_ids_found[0][0]):
+                if not _is_noise(elem.text):
                     valid_continuation.append(elem)
             
             if valid_continuation:
                 if self.debug_mode:
                     print(f"    Found {len(valid_continuation)} continuation elements for control {self.current_control_id}")
                 
-                for elem in valid_continuation:
-                    elem["is_continuation"] = True
-                self.current_control_elements.extend(valid_continuation)
+                self.current_continuation_elements.extend(valid_continuation)
         
         # Process control IDs
         for i, (element_index, control_id, control_element) in enumerate(control_ids_found):
@@ -145,19 +216,18 @@ class CNSSI1253Extractor:
             if i + 1 < len(control_ids_found):
                 end_index = control_ids_found[i + 1][0]
             
-            control_elements = page_elements[element_index:end_index]
-            
             if self.current_control_id == control_id:
-                self.current_control_elements.extend(control_elements)
+                self.current_control_elements.extend(itertools.islice(page_elements, element_index, end_index))
             else:
                 self.current_control_id = control_id
-                self.current_control_elements = control_elements
+                self.current_control_elements = page_elements[element_index:end_index]
+                self.current_continuation_elements = []
         
         # Handle pages with no control IDs
         if not control_ids_found and self.current_control_id:
             valid_elements = []
             for elem in page_elements:
-                elem_text = elem["text"].strip()
+                elem_text = elem.text
                 if not (("CNSSI No. 1253" in elem_text) or 
                        ("Control Text" in elem_text) or
                        ("Defined Value for NSS" in elem_text) or
@@ -174,35 +244,31 @@ class CNSSI1253Extractor:
         
         try:
             if self.debug_mode:
-                print(f"    Finalizing control {self.current_control_id} with {len(self.current_control_elements)} elements")
+                element_count = len(self.current_control_elements) + len(self.current_continuation_elements)
+                print(f"    Finalizing control {self.current_control_id} with {element_count} elements")
             
-            control_data = self._parse_control_group(self.current_control_elements, last_page)
+            control_data = self._parse_control_group(self.current_control_id, self.current_control_elements,
+                                                     self.current_continuation_elements, last_page)
             
             if control_data:
                 control_id = control_data["id"]
                 
+                # Text parts are joined once extraction is done
                 if control_id not in self.controls:
                     self.controls[control_id] = {
-                        "control_text": control_data["control_text"],
-                        "defined_value": control_data["defined_value"]
+                        "control_text": [],
+                        "defined_value": []
                     }
                     
                     if self.debug_mode:
                         print(f"  ✓ Added NEW control {control_id}")
-                else:
-                    existing = self.controls[control_id]
-                    
-                    if control_data["control_text"] and control_data["control_text"].strip():
-                        if existing["control_text"]:
-                            existing["control_text"] = (existing["control_text"] + " " + control_data["control_text"]).strip()
-                        else:
-                            existing["control_text"] = control_data["control_text"]
-                    
-                    if control_data["defined_value"] and control_data["defined_value"].strip():
-                        if existing["defined_value"]:
-                            existing["defined_value"] = (existing["defined_value"] + " " + control_data["defined_value"]).strip()
-                        else:
-                            existing["defined_value"] = control_data["defined_value"]
+                existing = self.controls[control_id]
+                
+                if control_data["control_text"]:
+                    existing["control_text"].append(control_data["control_text"])
+                
+                if control_data["defined_value"]:
+                    existing["defined_value"].append(control_data["defined_value"])
             
         except Exception as e:
             print(f"Error finalizing control {self.current_control_id}: {e}")
@@ -212,68 +278,46 @@ class CNSSI1253Extractor:
         
         self.current_control_id = None
         self.current_control_elements = []
+        self.current_continuation_elements = []
     
-    def _parse_control_group(self, elements: List[Dict], page_num: int) -> Optional[Dict]:
-        """Parse a group of elements that belong to one control."""
-        if not elements:
-            return None
-        
-        original_elements = [elem for elem in elements if not elem.get("is_continuation", False)]
-        continuation_elements = [elem for elem in elements if elem.get("is_continuation", False)]
-        
-        original_elements.sort(key=lambda x: (round(x["y0"], 1), x["x0"]))
-        continuation_elements.sort(key=lambda x: (round(x["y0"], 1), x["x0"]))
-        
-        sorted_elements = original_elements + continuation_elements
-        
-        full_text = " ".join([elem["text"] for elem in sorted_elements])
-        
-        enhancement_match = re.search(r'([A-Z]{2}-\d{1,2}\(\d+\))', full_text)
-        base_control_match = re.search(r'\b([A-Z]{2}-\d{1,2})\b(?!\(\d+\))', full_text)
+    def _join_text_parts(self):
+        """Join the text parts collected for each control into single strings."""
+        for control in self.controls.values():
+            for field, parts in control.items():
+                control[field] = " ".join(parts)
+    
+    def _parse_control_group(self, control_id: str, elements: List[TextSpan],
+                             continuation_elements: List[TextSpan], page_num: int) -> Optional[Dict]:
+        """Parse a group of elements that belong to one control, with its continued content last.
         
-        if enhancement_match:
-            control_id = enhancement_match.group(1)
-        elif base_control_match:
-            control_id = base_control_match.group(1)
-        else:
+        Both lists are already in reading order. Every span holding a control
+        ID starts a new group, so control_id is the only ID in the group."""
+        if not elements and not continuation_elements:
             return None
         
         control_text_elements = []
         defined_value_elements = []
         
-        for elem in sorted_elements:
-            elem_text = elem["text"].strip()
+        for elem in itertools.chain(elements, continuation_elements):
+            elem_text = elem.text
             
             if (("Control Text" in elem_text) or 
                 ("Defined Value for NSS" in elem_text) or
                 ("CNSSI No. 1253" in elem_text) or
-                (re.match(r'^[A-Z]-\d+$', elem_text))):
+                (_PAGE_LABEL_RE.match(elem_text))):
                 continue
             
-            x_pos = elem["x0"]
-            
-            # Better content detection for defined values
-            is_defined_value = (
-                elem_text.startswith("Not appropriate to define") or
-                elem_text.startswith("At least annually") or
-                elem_text.startswith("Not to exceed") or
-                elem_text.startswith("all NSS") or
-                elem_text.startswith("all organizations operating NSS") or
-                elem_text in ["All", "Disables", "3", "15 minutes", "30 minutes"]
-            )
+            x_pos = elem.x0
             
             if x_pos < 80:
                 continue
-            elif x_pos < 300 and not is_defined_value:
+            elif x_pos < 300 and not _is_defined_value(elem_text):
                 control_text_elements.append(elem)
             else:
                 defined_value_elements.append(elem)
         
-        control_text_elements.sort(key=lambda x: sorted_elements.index(x))
-        defined_value_elements.sort(key=lambda x: sorted_elements.index(x))
-        
-        control_text = " ".join([elem["text"] for elem in control_text_elements]).strip()
-        defined_value = " ".join([elem["text"] for elem in defined_value_elements]).strip()
+        control_text = " ".join([elem.text for elem in control_text_elements]).strip()
+        defined_value = " ".join([elem.text for elem in defined_value_elements]).strip()
         
         if control_id in control_text:
             control_text = control_text.replace(control_id, "").strip()
@@ -287,8 +331,12 @@ class CNSSI1253Extractor:
     def save_to_json(self, output_file: str):
         """Save extracted controls to JSON file."""
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.controls, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(self.controls, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.controls, f, indent=2, ensure_ascii=False)
             print(f"\nSuccessfully saved {len(self.controls)} controls to {output_file}")
         except Exception as e:
             print(f"Error saving to JSON: {e}")
@@ -302,18 +350,9 @@ class CNSSI1253Extractor:
             print("No controls found!")
             return
         
-        families = {}
-        enhancements = 0
-        base_controls = 0
-        
-        for control_id in self.controls.keys():
-            family = control_id.split('-')[0]
-            families[family] = families.get(family, 0) + 1
-            
-            if '(' in control_id:
-                enhancements += 1
-            else:
-                base_controls += 1
+        families = Counter(control_id.partition('-')[0] for control_id in self.controls)
+        enhancements = sum(1 for control_id in self.controls if '(' in control_id)
+        base_controls = len(self.controls) - enhancements
         
         print(f"Base controls: {base_controls}")
         print(f"Control enhancements: {enhancements}")
@@ -323,7 +362,7 @@ class CNSSI1253Extractor:
             print(f"  {family}: {count} controls")
         
         print("\nFirst 5 controls found:")
-        for i, (control_id, control_info) in enumerate(list(self.controls.items())[:5]):
+        for control_id, control_info in itertools.islice(self.controls.items(), 5):
             print(f"\n  {control_id}:")
             control_text = control_info.get("control_text", "")
             defined_value = control_info.get("defined_value", "")
@@ -342,19 +381,17 @@ class CNSSI1253Extractor:
                 
                 print(f"\n=== DEBUG PAGE {page_num} ===")
                 
-                text_dict = page.get_text("dict")
-                page_elements = self._extract_text_elements(text_dict, page_num)
+                page_elements = self._extract_text_elements(page, page_num)
                 
                 print(f"Found {len(page_elements)} text elements:")
                 for i, element in enumerate(page_elements[:20]):
-                    print(f"  Element {i}: '{element['text'][:50]}...' at ({element['x0']:.1f}, {element['y0']:.1f})")
+                    print(f"  Element {i}: '{element.text[:50]}...' at ({element.x0:.1f}, {element.y0:.1f})")
                     
-                    enhancement_match = re.search(r'([A-Z]{2}-\d{1,2}\(\d+\))', element['text'])
-                    base_control_match = re.search(r'\b([A-Z]{2}-\d{1,2})\b(?!\(\d+\))', element['text'])
+                    id_match = _find_control_id(element.text)
                     
-                    if enhancement_match or base_control_match:
-                        found_id = enhancement_match.group(1) if enhancement_match else base_control_match.group(1)
-                        control_type = "ENHANCEMENT" if enhancement_match else "BASE"
+                    if id_match:
+                        found_id, is_enhancement = id_match
+                        control_type = "ENHANCEMENT" if is_enhancement else "BASE"
                         print(f"    → Found {control_type} control ID: {found_id}")
             
             doc.close()
@@ -362,23 +399,51 @@ class CNSSI1253Extractor:
         except Exception as e:
             print(f"Error debugging page: {e}")
 
+@functools.lru_cache(maxsize=None)
+def _worker_document(pdf_path: str):
+    """Document handle opened once per worker process."""
+    return fitz.open(pdf_path)
+
+def _page_spans_worker(args: Tuple[str, int]):
+    """Process pool entry point: text spans of one page, or the exception raised reading them."""
+    pdf_path, page_index = args
+    try:
+        page = _worker_document(pdf_path)[page_index]
+        return CNSSI1253Extractor._extract_text_elements(page, page_index + 1)
+    except Exception as e:
+        return e
+
+def _print_usage():
+    print("Usage: python cnssi_1253_extractor.py <pdf_file> [--debug-page N] [--workers N]")
+    print("Example: python cnssi_1253_extractor.py cnssi_1253_overlay.pdf")
+    print("Example: python cnssi_1253_extractor.py cnssi_1253_overlay.pdf --debug-page 3")
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python cnssi_1253_extractor.py <pdf_file> [--debug-page N]")
-        print("Example: python cnssi_1253_extractor.py cnssi_1253_overlay.pdf")
-        print("Example: python cnssi_1253_extractor.py cnssi_1253_overlay.pdf --debug-page 3")
+        _print_usage()
         sys.exit(1)
     
     pdf_file = sys.argv[1]
+    options = sys.argv[2:]
+    
+    # Pages are read in this process unless --workers N asks for a pool
+    workers = 1
+    if '--workers' in options:
+        index = options.index('--workers') + 1
+        if index == len(options) or not options[index].isdecimal() or int(options[index]) < 1:
+            _print_usage()
+            sys.exit(1)
+        workers = int(options[index])
     
-    if len(sys.argv) == 4 and sys.argv[2] == "--debug-page":
+    # A debug page is read in this process, so --workers does not apply to it
+    if "--debug-page" in options:
         try:
-            debug_page_num = int(sys.argv[3])
+            debug_page_num = int(options[options.index("--debug-page") + 1])
             extractor = CNSSI1253Extractor(pdf_file)
             extractor.debug_mode = True
             extractor.debug_page(debug_page_num)
             return
-        except ValueError:
+        except (IndexError, ValueError):
             print("Invalid page number for debug mode")
             sys.exit(1)
     
@@ -390,7 +455,7 @@ def main():
     extractor = CNSSI1253Extractor(pdf_file)
     extractor.debug_mode = True
     
-    controls = extractor.extract_controls()
+    controls = extractor.extract_controls(workers)
     
     if controls:
         extractor.save_to_json(output_file)
@@ -4,12 +4,111 @@ CNSSI 1253 PDF Parser
 Extracts security controls from CNSSI-1253 PDF and converts to JSON format.
 """
 
+import functools
 import json
+import multiprocessing
 import re
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import fitz  # PyMuPDF
 
+try:
+    import orjson  # Optional faster JSON encoder
+except ImportError:
+    orjson = None
+
+
+# Control ID at the start of a line, e.g. AC-1 or AC-2(1)
+_CONTROL_ID_ANCHORED_RE = re.compile(r'^([A-Z]{2,3}-\d+(?:\(\d+\))?)')
+
+# Control ID anywhere in a line
+_CONTROL_ID_FREE_RE = re.compile(r'([A-Z]{2,3}-\d+(?:\(\d+\))?)')
+
+# Standalone X or + selection marker
+_MARKER_RE = re.compile(r'(?:^|\s)([X+])(?:\s|$)')
+
+# Line made up only of markers and whitespace
+_ONLY_MARKERS_RE = re.compile(r'^[X+\s]*$')
+
+# Marker left at the end of a title
+_TRAIL_MARKER_RE = re.compile(r'\s*[X+]\s*$')
+
+
+# Line predicates are pure functions of the text; table headers, markers and
+# footers repeat on every page, so their results are cached
+@functools.lru_cache(maxsize=4096)
+def _extract_control_id(text: str) -> Optional[str]:
+    """Extract control ID from text (e.g., AC-1, AC-2(1))."""
+    text_stripped = text.strip()
+    
+    # Match patterns like AC-1, AC-2(1), PM-1, etc.
+    match = _CONTROL_ID_ANCHORED_RE.match(text_stripped)
+    if match:
+        return match.group(1)
+    
+    # Alternative pattern - look anywhere in the text
+    match = _CONTROL_ID_FREE_RE.search(text)
+    if match:
+        start_pos = match.start()
+        if start_pos == 0 or text[start_pos-1].isspace():
+            return match.group(1)
+    
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_footnote_or_header(text: str) -> bool:
+    """Check if text is a footnote, header, or other non-control content."""
+    text_stripped = text.strip()
+    
+    # Check if it's just a number
+    if text_stripped.isdigit():
+        return True
+    
+    # Very short text
+    if len(text_stripped) < 3:
+        return True
+        
+    # Check for page numbers like D-1, D-35
+    if text.startswith('D-') and len(text) < 10:
+        return True
+    
+    # Check for specific footnote text; lowercase only lines that get this far
+    text_lower = text.lower()
+    return ('changes to the security control catalog' in text_lower or
+            'under the authority of nist' in text_lower or
+            'cnssi no.' in text_lower or
+            'appendix' in text_lower)
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_header_row(text_line: str, control_id: Optional[str]) -> bool:
+    """is_table_header_row() for a line whose control ID was already extracted."""
+    text_upper = text_line.upper()
+    
+    if 'ID' in text_upper and 'TITLE' in text_upper:
+        return True
+    if 'CONFIDENTIALITY' in text_upper and 'INTEGRITY' in text_upper:
+        return True
+    if 'AVAILABILITY' in text_upper:
+        return True
+    if text_line.strip() == 'L M H L M H L M H':
+        return True
+    if 'L M H' in text_line and text_line.count('L M H') >= 2:
+        return True
+    
+    # Also look for the start of actual control data
+    if control_id == 'AC-1':  # First control is usually AC-1
+        return True
+    
+    return False
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_only_markers(text: str) -> bool:
+    """Check if line contains only X, +, or whitespace."""
+    return _ONLY_MARKERS_RE.match(text) is not None
+
 
 class CNSSIParser:
     def __init__(self, pdf_path: str, debug: bool = False):
@@ -32,111 +131,53 @@ class CNSSIParser:
         """Close the PDF document."""
         if self.doc:
             self.doc.close()
+            self.doc = None
     
     def is_table_header_row(self, text_line: str) -> bool:
         """Check if a line contains table headers."""
-        text_upper = text_line.upper()
-        
-        if 'ID' in text_upper and 'TITLE' in text_upper:
-            return True
-        if 'CONFIDENTIALITY' in text_upper and 'INTEGRITY' in text_upper:
-            return True
-        if 'AVAILABILITY' in text_upper:
-            return True
-        if text_line.strip() == 'L M H L M H L M H':
-            return True
-        if 'L M H' in text_line and text_line.count('L M H') >= 2:
-            return True
-        
-        # Also look for the start of actual control data
         control_id = self.extract_control_id(text_line)
-        if control_id == 'AC-1':  # First control is usually AC-1
-            return True
-            
-        return False
+        return _is_header_row(text_line, control_id)
     
     def extract_control_id(self, text: str) -> Optional[str]:
         """Extract control ID from text (e.g., AC-1, AC-2(1))."""
-        text_stripped = text.strip()
-        
-        # Match patterns like AC-1, AC-2(1), PM-1, etc.
-        pattern = r'^([A-Z]{2,3}-\d+(?:\(\d+\))?)'
-        match = re.search(pattern, text_stripped)
-        if match:
-            return match.group(1)
-        
-        # Alternative pattern - look anywhere in the text
-        pattern2 = r'([A-Z]{2,3}-\d+(?:\(\d+\))?)'
-        match = re.search(pattern2, text)
-        if match:
-            start_pos = match.start()
-            if start_pos == 0 or text[start_pos-1].isspace():
-                return match.group(1)
-        
-        return None
+        return _extract_control_id(text)
     
     def has_selection_markers(self, text: str) -> bool:
         """Check if text contains X or + markers indicating selection."""
-        pattern = r'(?:^|\s)([X+])(?:\s|$)'
-        matches = re.findall(pattern, text)
-        return len(matches) > 0
+        # Most lines hold neither character; skip the regex for them
+        if 'X' not in text and '+' not in text:
+            return False
+        return _MARKER_RE.search(text) is not None
     
     def clean_title(self, title: str) -> str:
         """Clean and normalize control title."""
         # Remove extra whitespace and normalize
         title = ' '.join(title.split())
         # Remove any trailing markers that might have been included
-        title = re.sub(r'\s*[X+]\s*$', '', title)
+        title = _TRAIL_MARKER_RE.sub('', title)
         return title.strip()
     
     def is_only_markers(self, text: str) -> bool:
         """Check if line contains only X, +, or whitespace."""
-        pattern = r'^[X+\s]*$'
-        return re.match(pattern, text) is not None
+        return _is_only_markers(text)
     
     def is_footnote_or_header(self, text: str) -> bool:
         """Check if text is a footnote, header, or other non-control content."""
-        text_lower = text.lower()
-        text_stripped = text.strip()
-        
-        # Check if it's just a number
-        if text_stripped.isdigit():
-            return True
-        
-        # Check for specific footnote text
-        if 'changes to the security control catalog' in text_lower:
-            return True
-        if 'under the authority of nist' in text_lower:
-            return True
-        if 'cnssi no.' in text_lower:
-            return True
-        if 'appendix' in text_lower:
-            return True
-            
-        # Check for page numbers like D-1, D-35
-        if text.startswith('D-') and len(text) < 10:
-            return True
-            
-        # Very short text
-        if len(text_stripped) < 3:
-            return True
-            
-        # Pure number check
-        number_pattern = r'^\d+$'
-        if re.match(number_pattern, text_stripped):
-            return True
-            
-        return False
+        return _is_footnote_or_header(text)
     
     def should_continue_control_title(self, text: str, current_control_id: str) -> bool:
         """Determine if text should be added to current control's title."""
-        if self.is_footnote_or_header(text):
-            return False
-        
         # Don't continue if we hit another control ID
         if self.extract_control_id(text):
             return False
         
+        return self._continues_title(text)
+    
+    def _continues_title(self, text: str) -> bool:
+        """should_continue_control_title() for a line already known to hold no control ID."""
+        if self.is_footnote_or_header(text):
+            return False
+        
         # Don't continue if it's only selection markers
         if self.is_only_markers(text):
             return False
@@ -150,7 +191,10 @@ class CNSSIParser:
     def extract_controls_from_page(self, page_num: int) -> List[Dict]:
         """Extract controls from a single page."""
         page = self.doc[page_num]
-        text = page.get_text()
+        return self._extract_controls_from_text(page.get_text(), page_num)
+    
+    def _extract_controls_from_text(self, text: str, page_num: int) -> List[Dict]:
+        """Extract controls from the text of a single page."""
         lines = text.split('\n')
         
         controls = []
@@ -173,7 +217,7 @@ class CNSSIParser:
             # Check if we're entering a table or if we find a control
             control_id = self.extract_control_id(line)
             
-            if self.is_table_header_row(line):
+            if _is_header_row(line, control_id):
                 print(f"    Found table header at line {i}: {line}")
                 in_table = True
                 found_first_content_after_header = False
@@ -210,16 +254,16 @@ class CNSSIParser:
                 found_first_content_after_header = True
                 
                 # Save previous control if exists
-                if current_control and current_control['name']:
-                    controls.append(current_control)
+                if current_control and current_control['name_parts']:
+                    controls.append(self._finish_control(current_control))
                     if self.debug:
                         control_name = current_control['name'][:50] + '...' if len(current_control['name']) > 50 else current_control['name']
                         print(f"      Saved control: {current_control['id']} - {control_name} (Selected: {current_control['selected']})")
                 
-                # Start new control
+                # Start new control; title parts are joined when it is saved
                 current_control = {
                     'id': control_id,
-                    'name': '',
+                    'name_parts': [],
                     'selected': False
                 }
                 
@@ -229,7 +273,9 @@ class CNSSIParser:
                 # Check if there's title text on the same line after the ID
                 remaining = line[len(control_id):].strip()
                 if remaining and not self.is_only_markers(remaining):
-                    current_control['name'] = self.clean_title(remaining)
+                    cleaned_remaining = self.clean_title(remaining)
+                    if cleaned_remaining:
+                        current_control['name_parts'].append(cleaned_remaining)
                 
                 # Check for selection markers on this line
                 if self.has_selection_markers(line):
@@ -239,14 +285,11 @@ class CNSSIParser:
                 found_first_content_after_header = True
                 
                 # Check if this text should be added to the current control
-                if self.should_continue_control_title(line, current_control['id']):
+                if self._continues_title(line):
                     # Add to current control's name
                     cleaned_line = self.clean_title(line)
                     if cleaned_line:  # Only add if there's meaningful content
-                        if current_control['name']:
-                            current_control['name'] += ' ' + cleaned_line
-                        else:
-                            current_control['name'] = cleaned_line
+                        current_control['name_parts'].append(cleaned_line)
                 
                 # Check for selection markers on this line
                 if self.has_selection_markers(line):
@@ -258,8 +301,8 @@ class CNSSIParser:
                     controls[-1]['selected'] = True
         
         # Save the last control if exists
-        if current_control and current_control['name']:
-            controls.append(current_control)
+        if current_control and current_control['name_parts']:
+            controls.append(self._finish_control(current_control))
             if self.debug:
                 control_name = current_control['name'][:50] + '...' if len(current_control['name']) > 50 else current_control['name']
                 print(f"      Saved final control: {current_control['id']} - {control_name} (Selected: {current_control['selected']})")
@@ -267,19 +310,29 @@ class CNSSIParser:
         print(f"  Extracted {len(controls)} controls from page {page_num + 1}")
         return controls
     
-    def merge_continuation_controls(self, all_controls: List[Dict]) -> List[Dict]:
+    @staticmethod
+    def _finish_control(control: Dict) -> Dict:
+        """Join the title parts collected for a control into its name."""
+        control['name'] = ' '.join(control.pop('name_parts'))
+        return control
+    
+    def merge_continuation_controls(self, all_controls: Iterable[Dict]) -> List[Dict]:
         """Merge controls that continue across pages."""
-        merged_controls = []
+        return list(self._merge_continuations(all_controls))
+    
+    def _merge_continuations(self, controls: Iterable[Dict]) -> Iterator[Dict]:
+        """merge_continuation_controls() as a stream: each control is yielded
+        once the next regular control shows that nothing more continues it."""
+        last_control = None
         
-        for i, control in enumerate(all_controls):
+        for control in controls:
             if self.debug:
                 print(f"Processing control for merge: {control.get('id', 'NO_ID')} - {control.get('name', 'NO_NAME')[:30]}...")
             
             # Check if this is a continuation control
             if control.get('id') == 'CONTINUATION':
-                if merged_controls:
+                if last_control is not None:
                     # Append to the last control's name
-                    last_control = merged_controls[-1]
                     old_name = last_control['name']
                     last_control['name'] += ' ' + control['name']
                     if self.debug:
@@ -292,39 +345,55 @@ class CNSSIParser:
                     if self.debug:
                         print(f"  Warning: Found CONTINUATION control but no previous control to merge with")
             else:
-                # Regular control, just add it
-                merged_controls.append(control)
+                # Regular control; the previous one is now complete
+                if last_control is not None:
+                    yield last_control
+                last_control = control
         
-        return merged_controls
+        if last_control is not None:
+            yield last_control
     
-    def parse_document(self) -> List[Dict]:
-        """Parse the entire document and extract all controls."""
-        if not self.doc:
-            self.open_pdf()
-        
-        all_controls = []
+    def _iter_page_controls(self, workers: Optional[int]) -> Iterator[Dict]:
+        """Controls of every page, in page order, as each page is parsed."""
+        page_count = len(self.doc)
         
         # Process each page
-        for page_num in range(len(self.doc)):
-            print(f"Processing page {page_num + 1}...")
-            page_controls = self.extract_controls_from_page(page_num)
-            all_controls.extend(page_controls)
+        if workers == 1:
+            for page_num in range(page_count):
+                print(f"Processing page {page_num + 1}...")
+                yield from self.extract_controls_from_page(page_num)
+        else:
+            # Each worker opens its own handle; documents are not shared across processes
+            self.close_pdf()
+            with multiprocessing.Pool(workers) as pool:
+                page_texts = pool.imap(_page_text_worker,
+                                       [(self.pdf_path, page_num) for page_num in range(page_count)])
+                for page_num, text in enumerate(page_texts):
+                    print(f"Processing page {page_num + 1}...")
+                    yield from self._extract_controls_from_text(text, page_num)
+    
+    def parse_document(self, workers: Optional[int] = 1) -> List[Dict]:
+        """Parse the entire document and extract all controls.
         
-        # Merge controls that span across pages
-        merged_controls = self.merge_continuation_controls(all_controls)
+        Page text is read in this process by default; `workers` > 1 uses a
+        pool of that many processes and None one per CPU. Pages are parsed here
+        in page order, since titles continue across pages. Controls stream through the
+        continuation merge and the selection filter, so only the selected
+        controls are kept."""
+        if not self.doc:
+            self.open_pdf()
         
-        # Filter to only include selected controls and remove the selected field
-        selected_controls = []
-        for control in merged_controls:
-            if (control.get('id') and 
-                control['id'] != 'CONTINUATION' and 
-                control.get('name') and 
-                control.get('selected', False)):  # Only include if selected is True
-                selected_controls.append({
-                    'id': control['id'],
-                    'name': control['name']
-                    # Note: 'selected' field is intentionally omitted
-                })
+        # Merge controls that span across pages, then filter to only include
+        # selected controls and remove the selected field; every extracted
+        # control has 'id', 'name' and 'selected' keys
+        selected_controls = [
+            {'id': control['id'], 'name': control['name']}  # 'selected' is intentionally omitted
+            for control in self._merge_continuations(self._iter_page_controls(workers))
+            if (control['id'] and
+                control['id'] != 'CONTINUATION' and
+                control['name'] and
+                control['selected'])  # Only include if selected is True
+        ]
         
         self.controls = selected_controls
         return selected_controls
@@ -332,8 +401,12 @@ class CNSSIParser:
     def save_to_json(self, output_path: str):
         """Save the extracted controls to a JSON file."""
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.controls, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(self.controls, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.controls, f, indent=2, ensure_ascii=False)
             print(f"Successfully saved {len(self.controls)} controls to {output_path}")
         except Exception as e:
             print(f"Error saving JSON file: {e}")
@@ -352,16 +425,41 @@ class CNSSIParser:
                 print(f"  ✓ {control['id']}: {name_display}")
 
 
+@functools.lru_cache(maxsize=None)
+def _worker_document(pdf_path: str):
+    """Document handle opened once per worker process."""
+    return fitz.open(pdf_path)
+
+
+def _page_text_worker(args: Tuple[str, int]) -> str:
+    """Process pool entry point: plain text of one page."""
+    pdf_path, page_num = args
+    return _worker_document(pdf_path)[page_num].get_text()
+
+
+def _print_usage():
+    print("Usage: python cnssi_parser.py <input_pdf_path> <output_json_path> [--debug] [--workers N]")
+    print("Example: python cnssi_parser.py cnssi_1253_selection.pdf controls.json")
+    print("         python cnssi_parser.py cnssi_1253_selection.pdf controls.json --debug")
+
+
 def main():
     if len(sys.argv) < 3:
-        print("Usage: python cnssi_parser.py <input_pdf_path> <output_json_path> [--debug]")
-        print("Example: python cnssi_parser.py cnssi_1253_selection.pdf controls.json")
-        print("         python cnssi_parser.py cnssi_1253_selection.pdf controls.json --debug")
+        _print_usage()
         sys.exit(1)
     
     pdf_path = sys.argv[1]
     json_path = sys.argv[2]
-    debug = '--debug' in sys.argv
+    options = sys.argv[3:]
+    debug = '--debug' in options
+    # Pages are read in this process unless --workers N asks for a pool
+    workers = 1
+    if '--workers' in options:
+        index = options.index('--workers') + 1
+        if index == len(options) or not options[index].isdecimal() or int(options[index]) < 1:
+            _print_usage()
+            sys.exit(1)
+        workers = int(options[index])
     
     print("CNSSI 1253 PDF Parser")
     print("=" * 50)
@@ -369,7 +467,7 @@ def main():
     parser = CNSSIParser(pdf_path, debug=debug)
     
     try:
-        controls = parser.parse_document()
+        controls = parser.parse_document(workers)
         parser.save_to_json(json_path)
         parser.print_summary()
         
@@ -11,40 +11,49 @@ Merges the two JSON files according to the following rules:
 import json
 import logging
 import re
-from typing import Dict, Any, Set
+from typing import Dict, Any, KeysView
+
+try:
+    import orjson  # Optional faster JSON encoder and decoder
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Well-formed control ID: family, base number and optional enhancement number
+_CONTROL_ID_RE = re.compile(r'^([A-Z]{2})-(\d+)(?:\((\d+)\))?$')
+
 def load_json_file(filepath: str) -> Dict[str, Any]:
     """Load JSON file and return its contents."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(filepath, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         logger.info(f"Successfully loaded {filepath}")
         return data
     except FileNotFoundError:
         logger.error(f"File not found: {filepath}")
         raise
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError is a subclass
         logger.error(f"Invalid JSON in {filepath}: {e}")
         raise
     except Exception as e:
         logger.error(f"Error loading {filepath}: {e}")
         raise
 
-def extract_control_ids_from_selections(selections_data: list) -> Set[str]:
-    """Extract control IDs from the selections JSON (which is a list format)."""
-    control_ids = set()
-    for control in selections_data:
-        if isinstance(control, dict) and 'id' in control:
-            control_ids.add(control['id'])
-    return control_ids
+def index_selections(selections_data: list) -> Dict[str, dict]:
+    """Index the selections JSON (which is a list format) by control ID."""
+    return {control['id']: control for control in selections_data
+            if isinstance(control, dict) and 'id' in control}
 
-def extract_control_ids_from_overlay(overlay_data: dict) -> Set[str]:
-    """Extract control IDs from the overlay JSON (which is a dict format)."""
-    return set(overlay_data.keys())
+def extract_control_ids_from_overlay(overlay_data: dict) -> KeysView[str]:
+    """Control IDs of the overlay JSON (which is a dict format), as a live keys view."""
+    return overlay_data.keys()
 
 def convert_selection_to_overlay_format(selection_control: dict) -> dict:
     """
@@ -71,7 +80,7 @@ def natural_sort_key(control_id: str) -> tuple:
     and AC-1(1), AC-1(2), ..., AC-1(10), AC-1(11), etc.
     """
     # Split the control ID into parts
-    match = re.match(r'^([A-Z]{2})-(\d+)(?:\((\d+)\))?$', control_id)
+    match = _CONTROL_ID_RE.match(control_id)
     if match:
         family = match.group(1)
         base_num = int(match.group(2))
@@ -92,15 +101,18 @@ def merge_json_files(selections_file: str, overlay_file: str, output_file: str):
     selections_data = load_json_file(selections_file)
     overlay_data = load_json_file(overlay_file)
     
-    # Extract control IDs from both files
-    selections_control_ids = extract_control_ids_from_selections(selections_data)
+    # Extract control IDs from both files; the selections lookup is built in the same pass
+    selections_lookup = index_selections(selections_data)
+    selections_control_ids = selections_lookup.keys()
     overlay_control_ids = extract_control_ids_from_overlay(overlay_data)
+    # The overlay view grows as controls are added below, so count it now
+    overlay_count = len(overlay_control_ids)
     
     logger.info(f"Found {len(selections_control_ids)} controls in selections file")
-    logger.info(f"Found {len(overlay_control_ids)} controls in overlay file")
+    logger.info(f"Found {overlay_count} controls in overlay file")
     
     # Rule 1: Controls that exist in both files - do nothing (keep overlay version) but add selected field
-    common_controls = selections_control_ids.intersection(overlay_control_ids)
+    common_controls = selections_control_ids & overlay_control_ids
     logger.info(f"Found {len(common_controls)} controls that exist in both files - keeping overlay versions and marking as selected")
     
     # Add selected field to common controls
@@ -118,12 +130,6 @@ def merge_json_files(selections_file: str, overlay_file: str, output_file: str):
     selections_only_controls = selections_control_ids - overlay_control_ids
     logger.info(f"Found {len(selections_only_controls)} controls that exist only in selections file - adding to overlay and marking as selected")
     
-    # Create a lookup dictionary for selections controls
-    selections_lookup = {}
-    for control in selections_data:
-        if isinstance(control, dict) and 'id' in control:
-            selections_lookup[control['id']] = control
-    
     # Add missing controls to overlay data (but don't save yet)
     added_count = 0
     for control_id in selections_only_controls:
@@ -137,19 +143,18 @@ def merge_json_files(selections_file: str, overlay_file: str, output_file: str):
     logger.info(f"Successfully added {added_count} controls from selections to overlay")
     
     # Create ordered dictionary for final output
-    # Sort all control IDs using natural sorting
-    all_control_ids = list(overlay_data.keys())
-    sorted_control_ids = sorted(all_control_ids, key=natural_sort_key)
-    
-    # Build the final ordered dictionary
-    ordered_merged_data = {}
-    for control_id in sorted_control_ids:
-        ordered_merged_data[control_id] = overlay_data[control_id]
+    # Sort all control IDs using natural sorting; sorted() computes each key once
+    ordered_merged_data = {control_id: overlay_data[control_id]
+                           for control_id in sorted(overlay_data, key=natural_sort_key)}
     
     # Save the merged data with proper ordering
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(ordered_merged_data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(ordered_merged_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(ordered_merged_data, f, indent=2, ensure_ascii=False)
         logger.info(f"Successfully saved merged data to {output_file}")
     except Exception as e:
         logger.error(f"Error saving merged data: {e}")
@@ -160,7 +165,7 @@ def merge_json_files(selections_file: str, overlay_file: str, output_file: str):
     print("MERGE SUMMARY")
     print("="*60)
     print(f"Controls in selections file: {len(selections_control_ids)}")
-    print(f"Controls in overlay file: {len(overlay_control_ids)}")
+    print(f"Controls in overlay file: {overlay_count}")
     print(f"Controls existing in both files: {len(common_controls)}")
     print(f"Controls only in overlay file: {len(overlay_only_controls)}")
     print(f"Controls only in selections file: {len(selections_only_controls)}")
@@ -21,14 +21,17 @@ def main():
     
     new_selected = set()
     for control_id, control in new_data.items():
-        if control.get('selected', False) and not control.get('withdrawn', False):
-            # Check if any CIA selections exist
-            if 'selections' in control:
-                for cia in ['confidentiality', 'integrity', 'availability']:
-                    if any(control['selections'].get(cia, {}).get(level, False) 
-                           for level in ['low', 'moderate', 'high']):
-                        new_selected.add(control_id)
-                        break
+        if not control.get('selected') or control.get('withdrawn'):
+            continue
+        # Check if any CIA selections exist
+        selections = control.get('selections')
+        if not selections:
+            continue
+        for cia in ('confidentiality', 'integrity', 'availability'):
+            levels = selections.get(cia)
+            if levels and (levels.get('low') or levels.get('moderate') or levels.get('high')):
+                new_selected.add(control_id)
+                break
     
     # Calculate differences
     deselected = sorted(old_selected - new_selected)
@@ -5,17 +5,33 @@ Shows differences in control selections between the two versions.
 """
 
 import json
-from collections import defaultdict
+from collections import Counter
+
+try:
+    import orjson  # Optional faster JSON decoder
+except ImportError:
+    orjson = None
+
+# Security objectives and impact levels of the new format's selections
+CIA = ('confidentiality', 'integrity', 'availability')
+LEVELS = ('low', 'moderate', 'high')
+CIA_LEVELS = tuple((cia, level) for cia in CIA for level in LEVELS)
+
+def _load_json(filepath):
+    """Load a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r') as f:
+        return json.load(f)
 
 def load_old_cnssi():
     """Load the old CNSSI 1253 format (merged from selection and overlay files)."""
-    with open('merged_cnssi_1253.json', 'r') as f:
-        return json.load(f)
+    return _load_json('merged_cnssi_1253.json')
 
 def load_new_cnssi():
     """Load the new CNSSI 1253 2022 format."""
-    with open('extracted_cnssi_1253_2022.json', 'r') as f:
-        return json.load(f)
+    return _load_json('extracted_cnssi_1253_2022.json')
 
 def get_old_selected_controls(old_data):
     """Get set of selected controls from old format."""
@@ -25,45 +41,42 @@ def get_old_selected_controls(old_data):
             selected.add(control_id)
     return selected
 
-def get_new_selected_controls(new_data):
-    """Get set of selected controls from new format."""
+def analyze_new_controls(new_data, sample_size=5):
+    """Selected controls, CIA selection counts and parameter values of the new format, in one pass.
+    
+    Returns (selected, cia_stats, with_params, param_samples), where
+    cia_stats counts selections by (cia, level) and param_samples holds
+    the first `sample_size` (control_id, parameter_value) pairs in file order."""
     selected = set()
-    for control_id, control_data in new_data.items():
-        if control_data.get('selected', False) and not control_data.get('withdrawn', False):
-            # Check if any CIA selections exist
-            if 'selections' in control_data:
-                has_selection = False
-                for cia in ['confidentiality', 'integrity', 'availability']:
-                    if control_data['selections'].get(cia, {}):
-                        for level in ['low', 'moderate', 'high']:
-                            if control_data['selections'][cia].get(level, False):
-                                has_selection = True
-                                break
-                        if has_selection:
-                            break
-                if has_selection:
-                    selected.add(control_id)
-            elif control_data.get('selected', False):
-                selected.add(control_id)
-    return selected
-
-def compare_cia_selections(new_data):
-    """Analyze CIA selections in the new format."""
-    cia_stats = {
-        'confidentiality': defaultdict(int),
-        'integrity': defaultdict(int),
-        'availability': defaultdict(int)
-    }
+    cia_stats = Counter()
+    with_params = 0
+    param_samples = []
     
     for control_id, control_data in new_data.items():
-        if control_data.get('selected', False) and not control_data.get('withdrawn', False):
-            if 'selections' in control_data:
-                for cia in ['confidentiality', 'integrity', 'availability']:
-                    for level in ['low', 'moderate', 'high']:
-                        if control_data['selections'].get(cia, {}).get(level, False):
-                            cia_stats[cia][level] += 1
+        parameter_value = control_data.get('parameter_value')
+        if parameter_value:
+            with_params += 1
+            if len(param_samples) < sample_size:
+                param_samples.append((control_id, parameter_value))
+        
+        if not control_data.get('selected', False) or control_data.get('withdrawn', False):
+            continue
+        if 'selections' not in control_data:
+            selected.add(control_id)
+            continue
+        
+        # Selected if any CIA selection exists; count every selection made
+        selections = control_data['selections']
+        for cia, level in CIA_LEVELS:
+            try:
+                if not selections[cia][level]:
+                    continue
+            except (KeyError, TypeError):  # missing or null objective or level
+                continue
+            cia_stats[cia, level] += 1
+            selected.add(control_id)
     
-    return cia_stats
+    return selected, cia_stats, with_params, param_samples
 
 def main():
     print("=== CNSSI 1253 Version Comparison ===\n")
@@ -77,7 +90,7 @@ def main():
     
     # Get selected controls
     old_selected = get_old_selected_controls(old_data)
-    new_selected = get_new_selected_controls(new_data)
+    new_selected, cia_stats, new_with_params, param_samples = analyze_new_controls(new_data)
     
     print(f"\nOld version selected controls: {len(old_selected)}")
     print(f"New version selected controls: {len(new_selected)}")
@@ -95,49 +108,42 @@ def main():
     if only_old:
         print("\n--- Controls Selected Only in Old Version ---")
         for control_id in sorted(only_old):
-            old_control = old_data.get(control_id, {})
-            new_control = new_data.get(control_id, {})
+            old_control = old_data[control_id]
             print(f"{control_id}: {old_control.get('control_text', 'N/A')[:60]}...")
-            if control_id in new_data:
-                if new_control.get('withdrawn', False):
-                    print(f"  → Withdrawn in new version")
-                else:
-                    print(f"  → Not selected in new version")
-            else:
+            if (new_control := new_data.get(control_id)) is None:
                 print(f"  → Not present in new version")
+            elif new_control.get('withdrawn', False):
+                print(f"  → Withdrawn in new version")
+            else:
+                print(f"  → Not selected in new version")
     
     if only_new:
         print("\n--- Controls Selected Only in New Version ---")
         for control_id in sorted(only_new)[:20]:  # Show first 20
-            new_control = new_data.get(control_id, {})
+            new_control = new_data[control_id]
             print(f"{control_id}: {new_control.get('title', 'N/A')}")
             if new_control.get('justification'):
                 print(f"  Justification: {new_control['justification'][:80]}...")
     
     # Analyze CIA selections in new format
     print("\n=== CIA Triad Analysis (New Version) ===")
-    cia_stats = compare_cia_selections(new_data)
     
-    for cia in ['confidentiality', 'integrity', 'availability']:
+    for cia in CIA:
         print(f"\n{cia.capitalize()}:")
-        for level in ['low', 'moderate', 'high']:
-            count = cia_stats[cia][level]
+        for level in LEVELS:
+            count = cia_stats[cia, level]
             print(f"  {level.capitalize()}: {count} controls")
     
     # Check for controls with parameter values
     print("\n=== Parameter Values ===")
     old_with_params = sum(1 for c in old_data.values() if c.get('defined_value'))
-    new_with_params = sum(1 for c in new_data.values() if c.get('parameter_value'))
     print(f"Old version controls with defined values: {old_with_params}")
     print(f"New version controls with parameter values: {new_with_params}")
     
     # Sample some parameter value differences
     print("\n--- Sample Parameter Values (New Version) ---")
-    count = 0
-    for control_id, control in new_data.items():
-        if control.get('parameter_value') and count < 5:
-            print(f"{control_id}: {control['parameter_value'][:80]}...")
-            count += 1
+    for control_id, parameter_value in param_samples:
+        print(f"{control_id}: {parameter_value[:80]}...")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -20,6 +20,14 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 
+try:
+    import orjson  # Optional faster JSON encoder and decoder
+except ImportError:
+    orjson = None
+
+# Control ID like "AC-1" or "AC-1(1)": family, base number and optional enhancement number
+_CONTROL_ID_RE = re.compile(r'^([A-Z]{2,3})-(\d+)(?:\((\d+)\))?$')
+
 
 def parse_control_id(control_id: str) -> Tuple[str, int, int]:
     """
@@ -33,7 +41,7 @@ def parse_control_id(control_id: str) -> Tuple[str, int, int]:
         Enhancement number is 0 for base controls, positive for enhancements
     """
     # Match patterns like "AC-1" or "AC-1(1)"
-    match = re.match(r'^([A-Z]{2,3})-(\d+)(?:\((\d+)\))?$', control_id)
+    match = _CONTROL_ID_RE.match(control_id)
     
     if not match:
         raise ValueError(f"Invalid control ID format: {control_id}")
@@ -115,7 +123,7 @@ def print_sorting_summary(original_controls: List[Dict[str, Any]],
                 family_counts[family]['base'] += 1
         return family_counts
     
-    original_counts = count_by_family(original_controls)
+    # Sorting only reorders controls, so the sorted list gives the counts for both
     sorted_counts = count_by_family(sorted_controls)
     
     print(f"Processed {len(sorted_controls)} controls across {len(sorted_counts)} families:")
@@ -126,11 +134,14 @@ def print_sorting_summary(original_controls: List[Dict[str, Any]],
         total = base_count + enh_count
         print(f"  {family}: {total} total ({base_count} base, {enh_count} enhancements)")
     
-    # Check if any controls were moved
-    moves = 0
-    for i, (orig, sort) in enumerate(zip(original_controls, sorted_controls)):
-        if orig['id'] != sort['id']:
-            moves += 1
+    # Check if any controls were moved; list equality settles the common
+    # already-sorted case, and only a changed order is counted position by position
+    original_ids = [control['id'] for control in original_controls]
+    sorted_ids = [control['id'] for control in sorted_controls]
+    if original_ids == sorted_ids:
+        moves = 0
+    else:
+        moves = sum(1 for orig_id, sorted_id in zip(original_ids, sorted_ids) if orig_id != sorted_id)
     
     if moves > 0:
         print(f"\nReordered {moves} controls for proper sorting.")
@@ -154,8 +165,12 @@ def main():
     try:
         # Read and parse JSON
         print(f"Reading {input_file}...")
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(input_file, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         # Validate structure
         validate_json_structure(data)
@@ -173,14 +188,18 @@ def main():
         
         # Write output
         print(f"Writing sorted controls to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         
         # Print summary
         print_sorting_summary(original_controls, sorted_controls)
         print(f"\nSorting complete! Output saved to: {output_file}")
         
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError is a subclass
         print(f"Error: Invalid JSON in '{input_file}': {e}")
         sys.exit(1)
     except Exception as e: